@@ -6,7 +6,13 @@ import asyncio
 import aiohttp
 import ujson
 import time
-from typing import Dict, Any, Optional, List
+# Prefer orjson for response parsing (parses bytes directly); fall back to ujson
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = ujson.loads
+from typing import Dict, Any, Optional, List, Tuple
 from asyncio_throttle.throttler import Throttler
 from config import (
     DBOTX_BASE_URL, DBOTX_API_KEY, HTTP_TIMEOUT,
@@ -27,6 +33,11 @@ class DBOTXClient:
         self.connector: Optional[aiohttp.TCPConnector] = None
         self.throttler = Throttler(rate_limit=CONCURRENT_LIMIT, period=1.0)
 
+        # (chain, pair) -> (fetched_at, fetch task); one alert fanning out to many
+        # subscribers shares a single pair_info request within the TTL
+        self._pair_info_cache: Dict[Tuple[str, str], Tuple[float, asyncio.Future]] = {}
+        self.pair_info_ttl = 2.0
+
         # Request timeout configuration
         self.timeout = aiohttp.ClientTimeout(
             total=HTTP_TIMEOUT,
@@ -133,31 +144,32 @@ class DBOTXClient:
                         json=data,
                         params=params
                     ) as response:
-                        response_text = await response.text()
+                        body = await response.read()
 
                         # Log response time for monitoring
                         response_time = (time.time() - start_time) * 1000
 
                         logger.info(f"📥 API_RESPONSE: Received in {response_time:.2f}ms")
                         logger.info(f"   ├─ Status: {response.status}")
-                        logger.info(f"   ├─ Content-Length: {len(response_text)} bytes")
+                        logger.info(f"   ├─ Content-Length: {len(body)} bytes")
 
                         if response.status == 200:
                             try:
-                                result = ujson.loads(response_text)
+                                result = _json_loads(body)
                                 logger.info(f"   ├─ Has error: {result.get('err', True)}")
                                 logger.info(f"   └─ Response keys: {list(result.keys())}")
                                 return result
-                            except ujson.JSONDecodeError as json_err:
+                            except ValueError as json_err:
                                 logger.error(f"❌ API_RESPONSE: Invalid JSON")
                                 logger.error(f"   ├─ Error: {json_err}")
-                                logger.error(f"   └─ Raw response (first 200 chars): {response_text[:200]}")
+                                logger.error(f"   └─ Raw response (first 200 chars): {body[:200].decode(errors='replace')}")
                                 return {'err': True, 'message': 'Invalid JSON response'}
                         else:
-                            error_msg = f"HTTP {response.status}: {response_text[:200]}"
+                            response_preview = body[:200].decode(errors='replace')
+                            error_msg = f"HTTP {response.status}: {response_preview}"
                             logger.error(f"❌ API_RESPONSE: HTTP Error")
                             logger.error(f"   ├─ Status: {response.status}")
-                            logger.error(f"   └─ Message: {response_text[:200]}")
+                            logger.error(f"   └─ Message: {response_preview}")
 
                             if attempt == MAX_RETRIES - 1:  # Last attempt
                                 return {'err': True, 'message': error_msg}
@@ -209,6 +221,40 @@ class DBOTXClient:
 
     # Token Data Operations
     async def get_pair_info(self, chain: str, pair: str) -> Dict[str, Any]:
+        """Get pair information, sharing one in-flight or recent (< pair_info_ttl) fetch per pair
+
+        The returned dict may be shared between callers and must not be mutated.
+        """
+        key = (chain, pair)
+        now = time.monotonic()
+        entry = self._pair_info_cache.get(key)
+        if entry is not None and now - entry[0] < self.pair_info_ttl:
+            logger.info(f"♻️ API_CLIENT: get_pair_info reusing fetch for {chain} {pair}")
+            return await asyncio.shield(entry[1])
+
+        if len(self._pair_info_cache) >= 256:
+            self._pair_info_cache = {
+                k: v for k, v in self._pair_info_cache.items()
+                if now - v[0] < self.pair_info_ttl
+            }
+
+        task = asyncio.ensure_future(self._fetch_pair_info(chain, pair))
+        entry = (now, task)
+        self._pair_info_cache[key] = entry
+        try:
+            # shield: a cancelled caller must not cancel the fetch others are awaiting
+            result = await asyncio.shield(task)
+        except BaseException:
+            if self._pair_info_cache.get(key) is entry and task.done():
+                del self._pair_info_cache[key]
+            raise
+
+        # Only successful responses are worth sharing
+        if result.get('err', True) and self._pair_info_cache.get(key) is entry:
+            del self._pair_info_cache[key]
+        return result
+
+    async def _fetch_pair_info(self, chain: str, pair: str) -> Dict[str, Any]:
         """Get comprehensive token/pair information for validation
 
         Args:
@@ -7,7 +7,6 @@ Telethon USER + BOT mode with integrated monitoring
 import asyncio
 import logging
 import sys
-import signal
 import time
 from typing import Optional, List
 from telethon import TelegramClient, events, Button
@@ -25,6 +24,7 @@ except ImportError:
 from config import API_ID, API_HASH, BOT_TOKEN, OWNER_CHAT_ID, SUPABASE_URL, SUPABASE_KEY, SUPABASE_ANON_KEY, SUPABASE_SERVICE_KEY, SCRAPER_PHONE, SCRAPER_PASSWORD
 from handlers_telethon import register_bot_handlers, register_user_handlers
 from api_client import client as dbotx_client
+from utils import close_dexscreener_session, install_shutdown_handlers
 from models import storage
 
 # Required Supabase credentials - bot will NOT start without these exact values
@@ -423,6 +423,10 @@ class UltraFastTradingBot:
 
             # Close API connections
             await dbotx_client.close_session()
+            await close_dexscreener_session()
+
+            # Persist coalesced channel stats
+            storage.flush_channel_metrics()
 
             # Unsubscribe from verification listener
             if self.verification_channel:
@@ -472,17 +476,10 @@ class UltraFastTradingBot:
 bot = UltraFastTradingBot()
 
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
-    logger.info(f"Received signal {signum}")
-    asyncio.create_task(bot.stop())
-
-
 async def main():
     """Main entry point"""
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Register signal handlers on the running loop so shutdown runs as a task
+    install_shutdown_handlers(bot.stop)
 
     try:
         # Initialize bot
@@ -57,6 +57,10 @@ _delay_max = config('HUMAN_DELAY_MAX', default='0.1')
 HUMAN_DELAY_MIN = float(_delay_min) if _delay_min else 0.05
 HUMAN_DELAY_MAX = float(_delay_max) if _delay_max else 0.1
 
+# CPU cores to pin the realtime monitor to, e.g. "2" or "2,3" (empty = no pinning)
+_cpu_affinity = config('CPU_AFFINITY', default='')
+CPU_AFFINITY = {int(cpu) for cpu in str(_cpu_affinity).split(',') if cpu.strip().isdigit()}
+
 # Session Configuration
 SESSION_NAME = 'trading_bot_session'
 WORKDIR = os.path.dirname(os.path.abspath(__file__))
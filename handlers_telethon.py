@@ -676,18 +676,17 @@ async def handle_user_id_input(event):
                 return
 
         # Add user to allowed list
-        allowed_users = subscription.allowed_user_ids or []
+        allowed_users = subscription.allowed_user_ids
         if target_user_id in allowed_users:
             await event.respond(f"⚠️ User `{target_user_id}` is already in the allowed list")
             if user_id in user_states:
                 del user_states[user_id]
             return
 
-        allowed_users.append(target_user_id)
         storage.update_channel_settings(
             user_id,
             channel_id,
-            allowed_user_ids=allowed_users,
+            allowed_user_ids=allowed_users | {target_user_id},
             filter_mode=FilterMode.SPECIFIC_USERS
         )
 
@@ -1519,15 +1518,15 @@ async def contract_handler(event):
 
         if response and not response.get('err', True):
             # Handle successful response
-            res_data = response.get('res', {})
+            res_data = response.get('res')
             order_id = res_data.get('id', 'Unknown') if isinstance(res_data, dict) else 'Unknown'
 
             logger.info(f"✅ CONTRACT_HANDLER: Trade SUCCESSFUL")
             logger.info(f"   ├─ Order ID: {order_id}")
             logger.info(f"   └─ Response data: {res_data}")
 
-            # Store order in database with chain-specific settings
-            storage.create_order(
+            # Store order in database with chain-specific settings (off the event loop)
+            await storage.a_create_order(
                 order_id=order_id,
                 user_id=user_id,
                 chain=chain,
@@ -2720,7 +2719,7 @@ async def handle_channel_users_callback(callback_query, channel_id):
         await callback_query.answer("Channel not found", alert=True)
         return
 
-    allowed_users = subscription.allowed_user_ids or []
+    allowed_users = sorted(subscription.allowed_user_ids)
 
     text = f"**👥 Manage Users for {subscription.channel_title}**\n\n"
     text += f"Filter mode: **Specific Users**\n"
@@ -2791,9 +2790,9 @@ async def handle_remove_user_callback(callback_query, params):
         return
 
     # Remove user from allowed list
-    allowed_users = subscription.allowed_user_ids or []
+    allowed_users = subscription.allowed_user_ids
     if user_to_remove in allowed_users:
-        allowed_users.remove(user_to_remove)
+        allowed_users = allowed_users - {user_to_remove}
 
         # If no users left, reset filter mode to ALL_MESSAGES
         if len(allowed_users) == 0:
@@ -2918,9 +2917,6 @@ async def monitor_channel_messages(event):
             logger.debug(f"WebContent .message repr: {repr(event.message.message)}")
             logger.debug(f"WebContent .message bytes: {event.message.message.encode('utf-8')}")
 
-        # Get all subscriptions for this channel
-        all_channels = storage.get_all_active_channels()
-
         # Normalize the incoming channel ID to match storage format
         incoming_id = int(channel_id)
 
@@ -2932,17 +2928,15 @@ async def monitor_channel_messages(event):
 
         logger.debug(f"WebContent Event channel ID: {channel_id} -> Normalized: {normalized_event_id}")
 
-        for channel_sub in all_channels:
-            stored_id = int(channel_sub.channel_id)
-
-            logger.debug(f"WebContent Comparing: Event={normalized_event_id} vs Stored={stored_id} ({channel_sub.channel_title})")
+        # Get all subscriptions for this channel
+        matching_channels = await storage.a_get_active_subscriptions(normalized_event_id)
+        if not matching_channels:
+            logger.debug(f"WebContent No active subscription for channel {normalized_event_id}")
 
-            if stored_id == normalized_event_id:
-                logger.info(f"WebContent MATCH FOUND! Processing for user {channel_sub.user_id}: {channel_sub.channel_title}")
-                # Process the message
-                await process_channel_message(event, channel_sub)
-            else:
-                logger.debug(f"WebContent No match for channel {channel_sub.channel_title}")
+        for channel_sub in matching_channels:
+            logger.info(f"WebContent MATCH FOUND! Processing for user {channel_sub.user_id}: {channel_sub.channel_title}")
+            # Process the message
+            await process_channel_message(event, channel_sub)
 
     except Exception as e:
         logger.error(f"Error in channel monitoring: {e}", exc_info=True)
@@ -3082,7 +3076,7 @@ async def process_channel_message(event, channel_sub):
 
         # Get user for chain check
         user_id = channel_sub.user_id
-        user = storage.get_user(user_id)
+        user = await storage.a_get_user(user_id)
 
         if not user:
             logger.error(f"❌ User {user_id} NOT FOUND in database")
@@ -3145,10 +3139,8 @@ async def process_channel_message(event, channel_sub):
 
             # Update channel stats
             try:
-                channel_sub.total_trades += 1
-                channel_sub.last_message_at = time.time()
-                storage.update_channel_subscription(channel_sub)
-                logger.info(f"📊 Channel stats updated successfully")
+                storage.bump_channel(channel_sub.channel_id, channel_sub.user_id)
+                logger.info(f"📊 Channel stats queued for update")
             except Exception as stats_error:
                 logger.error(f"⚠️ Failed to update channel stats (non-critical): {stats_error}")
         else:
@@ -3,19 +3,68 @@ Data Models for Ultra-Fast Trading Bot
 Memory-optimized storage for instant access
 """
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, FrozenSet
 import time
-import ujson
+# Prefer orjson (faster, writes bytes directly); fall back to ujson
+try:
+    import orjson
+    # default=dict lets read-only settings views (MappingProxyType) serialize
+    _json_dumps = lambda data: orjson.dumps(data, default=dict, option=orjson.OPT_NON_STR_KEYS)
+    _json_loads = orjson.loads
+except ImportError:
+    import ujson
+    _json_dumps = lambda data: ujson.dumps(data, default=dict).encode()
+    _json_loads = ujson.loads
 import sqlite3
 import asyncio
 import threading
+import functools
+import itertools
+import operator
+from contextlib import contextmanager
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import logging
 
+from config import DEFAULT_SETTINGS
+
 logger = logging.getLogger(__name__)
 
+# (monotonic stamp, wall-clock stamp) of the last real time.time() call
+_NOW_CACHE = [0.0, 0.0]
+
+
+def _now() -> float:
+    """Wall-clock time, refreshed at most every 5ms"""
+    mono = time.monotonic()
+    if mono - _NOW_CACHE[0] > 0.005:
+        _NOW_CACHE[0] = mono
+        _NOW_CACHE[1] = time.time()
+    return _NOW_CACHE[1]
+
+
+# Pickled once; loading is a cheap deep copy for plain dict/str/number trees
+_DEFAULT_SETTINGS_BYTES = pickle.dumps(DEFAULT_SETTINGS)
+_DEFAULT_CHAIN_BYTES = {
+    chain: pickle.dumps(chain_defaults)
+    for chain, chain_defaults in DEFAULT_SETTINGS.items()
+    if isinstance(chain_defaults, dict)
+}
+
+
+def _clone_defaults() -> Dict[str, Any]:
+    """Return an independent deep copy of DEFAULT_SETTINGS"""
+    return pickle.loads(_DEFAULT_SETTINGS_BYTES)
+
+
+def _clone_chain_defaults(chain: str) -> Dict[str, Any]:
+    """Return an independent deep copy of one chain's default settings"""
+    data = _DEFAULT_CHAIN_BYTES.get(chain)
+    return pickle.loads(data) if data is not None else {}
+
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User model with trading settings"""
     user_id: int
@@ -25,18 +74,30 @@ class User:
     settings: Dict[str, Any] = field(default_factory=dict)
     api_key: Optional[str] = None
     wallet_id: Optional[str] = None
-    created_at: float = field(default_factory=time.time)
-    last_active: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=_now)
+    last_active: float = field(default_factory=_now)
     is_verified: bool = False
     verified_at: Optional[float] = None
     wallet_pattern: Optional[str] = None
+    # Cached reference to settings['solana'], the chain almost every lookup hits
+    _solana: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Bind cached setting references once fields are set"""
+        self._refresh_setting_cache()
+
+    def _refresh_setting_cache(self):
+        """Re-bind the cached solana settings after settings change"""
+        self._solana = self.settings.get('solana')
 
     def update_activity(self):
         """Update last activity timestamp"""
-        self.last_active = time.time()
+        self.last_active = _now()
 
     def get_setting(self, key: str, default: Any = None, chain: str = 'solana') -> Any:
         """Get a specific setting value for a chain"""
+        if chain == 'solana' and self._solana is not None:
+            return self._solana.get(key, default)
         if chain in self.settings:
             return self.settings[chain].get(key, default)
         return default
@@ -44,8 +105,9 @@ class User:
     def set_setting(self, key: str, value: Any, chain: str = 'solana'):
         """Set a specific setting value for a chain"""
         if chain not in self.settings:
-            from config import DEFAULT_SETTINGS
-            self.settings[chain] = DEFAULT_SETTINGS.get(chain, {}).copy()
+            self.settings[chain] = _clone_chain_defaults(chain)
+            if chain == 'solana':
+                self._refresh_setting_cache()
         self.settings[chain][key] = value
     
     def update_setting(self, key: str, value: Any, chain: str = 'solana'):
@@ -55,8 +117,7 @@ class User:
     def get_chain_settings(self, chain: str) -> Dict[str, Any]:
         """Get all settings for a specific chain"""
         if chain not in self.settings:
-            from config import DEFAULT_SETTINGS
-            return DEFAULT_SETTINGS.get(chain, {}).copy()
+            return _clone_chain_defaults(chain)
         return self.settings.get(chain, {})
 
     def to_dict(self) -> Dict[str, Any]:
@@ -96,7 +157,12 @@ class FilterMode(Enum):
     SPECIFIC_USERS = "users"  # Updated to match guide
 
 
-@dataclass
+# Value -> member maps; a dict hit is much cheaper than Enum.__call__ per row
+_CHANNEL_TYPE_MAP = {member.value: member for member in ChannelType}
+_FILTER_MODE_MAP = {member.value: member for member in FilterMode}
+
+
+@dataclass(slots=True)
 class ChannelSubscription:
     """Channel subscription model for MTProto monitoring"""
     channel_id: int
@@ -106,9 +172,9 @@ class ChannelSubscription:
     channel_type: ChannelType = ChannelType.CHANNEL
     is_active: bool = True
     filter_mode: FilterMode = FilterMode.ALL_MESSAGES
-    allowed_user_ids: List[int] = field(default_factory=list)
+    allowed_user_ids: FrozenSet[int] = field(default_factory=frozenset)
     custom_buy_amount: Optional[float] = None
-    created_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=_now)
     last_message_at: Optional[float] = None
     total_trades: int = 0
 
@@ -122,7 +188,7 @@ class ChannelSubscription:
             'channel_type': self.channel_type.value,
             'is_active': self.is_active,
             'filter_mode': self.filter_mode.value,
-            'allowed_user_ids': self.allowed_user_ids,
+            'allowed_user_ids': sorted(self.allowed_user_ids),
             'custom_buy_amount': self.custom_buy_amount,
             'created_at': self.created_at,
             'last_message_at': self.last_message_at,
@@ -137,18 +203,18 @@ class ChannelSubscription:
             user_id=data['user_id'],
             channel_title=data['channel_title'],
             channel_username=data.get('channel_username'),
-            channel_type=ChannelType(data.get('channel_type', 'channel')),
+            channel_type=_CHANNEL_TYPE_MAP[data.get('channel_type', 'channel')],
             is_active=data.get('is_active', True),
-            filter_mode=FilterMode(data.get('filter_mode', 'all')),
-            allowed_user_ids=data.get('allowed_user_ids', []),
+            filter_mode=_FILTER_MODE_MAP[data.get('filter_mode', 'all')],
+            allowed_user_ids=frozenset(data.get('allowed_user_ids') or ()),
             custom_buy_amount=data.get('custom_buy_amount'),
-            created_at=data.get('created_at', time.time()),
+            created_at=data.get('created_at', _now()),
             last_message_at=data.get('last_message_at'),
             total_trades=data.get('total_trades', 0)
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeOrder:
     """Trade order model for tracking"""
     order_id: str
@@ -158,7 +224,7 @@ class TradeOrder:
     order_type: str  # 'buy', 'sell', 'dev_sell', 'migrate'
     amount: float
     status: str = 'pending'  # 'pending', 'completed', 'failed'
-    created_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=_now)
     completed_at: Optional[float] = None
     error_message: Optional[str] = None
     settings: Dict[str, Any] = field(default_factory=dict)
@@ -166,13 +232,13 @@ class TradeOrder:
     def mark_completed(self):
         """Mark order as completed"""
         self.status = 'completed'
-        self.completed_at = time.time()
+        self.completed_at = _now()
 
     def mark_failed(self, error: str):
         """Mark order as failed with error"""
         self.status = 'failed'
         self.error_message = error
-        self.completed_at = time.time()
+        self.completed_at = _now()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -191,23 +257,125 @@ class TradeOrder:
         }
 
 
+def _decode_json(data: Any) -> Any:
+    """Decode a JSON column, falling back to an empty dict"""
+    if not data:
+        return {}
+    try:
+        return _json_loads(data)
+    except (ValueError, TypeError):
+        # orjson.JSONDecodeError and ujson's errors are both ValueErrors
+        return {}
+
+
+def _encode_user_ids(user_ids) -> str:
+    """Encode allowed user IDs as a comma-separated string of decimal IDs"""
+    return ','.join(map(str, sorted(user_ids)))
+
+
+def _decode_user_ids(data: Any) -> FrozenSet[int]:
+    """Decode the comma-separated allowed_user_ids column into a frozenset"""
+    if not data:
+        return frozenset()
+    if data[0] in '[{':
+        # JSON lists written by older versions (e.g. restored backups)
+        return frozenset(_decode_json(data) or ())
+    return frozenset(map(int, data.split(',')))
+
+
+# Explicit column orders; SELECTs use these so rows can be unpacked by position
+_USER_COLUMNS = (
+    'user_id', 'username', 'first_name', 'last_name', 'settings', 'api_key',
+    'wallet_id', 'created_at', 'last_active', 'is_verified', 'verified_at',
+    'wallet_pattern'
+)
+_ORDER_COLUMNS = (
+    'order_id', 'user_id', 'chain', 'pair', 'order_type', 'amount', 'status',
+    'created_at', 'completed_at', 'error_message', 'settings'
+)
+_CHANNEL_COLUMNS = (
+    'channel_id', 'user_id', 'channel_title', 'channel_username', 'channel_type',
+    'is_active', 'filter_mode', 'allowed_user_ids', 'custom_buy_amount',
+    'created_at', 'last_message_at', 'total_trades'
+)
+
+
+def _build_materializer(cls, columns, converters: Dict[str, Any]):
+    """Generate a tuple-row -> cls function with columns unpacked by index"""
+    # Converters and the class become closure cells of the generated function
+    names = {column: f'_conv_{column}' for column in converters}
+    args = ', '.join(
+        f'{column}={names[column]}(row[{index}])' if column in names else f'{column}=row[{index}]'
+        for index, column in enumerate(columns)
+    )
+    params = ', '.join(['cls'] + list(names.values()))
+    source = (
+        f'def _factory({params}):\n'
+        f'    def materialize(row):\n'
+        f'        return cls({args})\n'
+        f'    return materialize\n'
+    )
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace['_factory'](cls, *converters.values())
+
+
+_materialize_user = _build_materializer(User, _USER_COLUMNS, {
+    'settings': _decode_json,
+    'is_verified': bool
+})
+_materialize_order = _build_materializer(TradeOrder, _ORDER_COLUMNS, {
+    'settings': _decode_json
+})
+_materialize_subscription = _build_materializer(ChannelSubscription, _CHANNEL_COLUMNS, {
+    'channel_type': _CHANNEL_TYPE_MAP.__getitem__,
+    'is_active': bool,
+    'filter_mode': _FILTER_MODE_MAP.__getitem__,
+    'allowed_user_ids': _decode_user_ids
+})
+
+_SELECT_USERS = f"SELECT {', '.join(_USER_COLUMNS)} FROM users"
+_SELECT_ORDERS = f"SELECT {', '.join(_ORDER_COLUMNS)} FROM orders"
+_SELECT_CHANNELS = f"SELECT {', '.join(_CHANNEL_COLUMNS)} FROM channel_subscriptions"
 
 
 class SQLiteStorage:
     """Ultra-fast SQLite storage for trading bot with persistence"""
     
+    # Columns create_channel_subscription may overwrite on an existing row
+    _CHANNEL_UPSERT_COLUMNS = frozenset({
+        'channel_username', 'channel_type', 'is_active', 'filter_mode',
+        'allowed_user_ids', 'custom_buy_amount', 'created_at',
+        'last_message_at', 'total_trades'
+    })
+    
     def __init__(self, db_path: str = "trading_bot.db"):
         self.db_path = db_path
+        # Held only around writes on the shared connection; WAL lets readers
+        # use their own thread-local connections without any lock
         self._lock = threading.Lock()
+        self._tls = threading.local()
+        self._write_seq = 0
+        # Writes are serialized on one thread; WAL lets readers run in parallel
+        self._write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite-writer')
+        self._read_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sqlite-reader')
         self._initialize_database()
+        self._conn = self._open_state_connection()
+        # Active-channel dispatch cache, rebuilt when PRAGMA data_version moves
+        self._active_cache: Optional[Dict[str, Any]] = None
+        # (channel_id, user_id) -> (trades to add, last_message_at), flushed in batches
+        self._pending_metrics: Dict[tuple, tuple] = {}
+        self._metrics_task: Optional[asyncio.Task] = None
+        # FIFO of queued order writes: TradeOrder inserts and (order_id, status, error)
+        # updates, persisted in batches by the order writer
+        self._pending_order_ops: List[Any] = []
+        self._order_writer_task: Optional[asyncio.Task] = None
     
     def _initialize_database(self):
         """Initialize SQLite database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # journal_mode is persistent in the file; set it once here
             conn.execute('PRAGMA journal_mode=WAL')
-            conn.execute('PRAGMA synchronous=NORMAL')
-            conn.execute('PRAGMA cache_size=10000')
-            conn.execute('PRAGMA temp_store=MEMORY')
             
             # Users table
             conn.execute('''
@@ -226,6 +394,7 @@ class SQLiteStorage:
                     wallet_pattern TEXT
                 )
             ''')
+            self._migrate_users_table(conn)
             
             # Orders table
             conn.execute('''
@@ -266,59 +435,121 @@ class SQLiteStorage:
                 )
             ''')
             
-            # User states table
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS user_states (
-                    user_id INTEGER PRIMARY KEY,
-                    state TEXT,
-                    timestamp REAL,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            ''')
+            self._migrate_allowed_user_ids(conn)
             
             conn.commit()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection PRAGMAs applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA mmap_size=268435456')
+        return conn
+    
+    def _read_conn(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute('PRAGMA query_only=1')
+            self._tls.conn = conn
+        return conn
+    
+    @contextmanager
+    def _write_txn(self, bump: bool = True):
+        """Run a write on the shared connection under the write lock"""
+        with self._lock:
+            with self._conn:
+                yield self._conn
+            # Order and trade-counter writes pass bump=False: they never change user
+            # settings or subscription config, so change_version() stays put and
+            # caches stay warm
+            if bump:
+                self._write_seq += 1
+    
+    def _migrate_users_table(self, conn: sqlite3.Connection):
+        """Add verification columns missing from databases created by older versions"""
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(users)')}
+        for column, definition in (
+            ('is_verified', 'BOOLEAN DEFAULT 0'),
+            ('verified_at', 'REAL'),
+            ('wallet_pattern', 'TEXT')
+        ):
+            if column not in existing:
+                conn.execute(f'ALTER TABLE users ADD COLUMN {column} {definition}')
+                logger.info(f"🔧 Added missing users.{column} column")
+    
+    def _open_state_connection(self) -> sqlite3.Connection:
+        """Open the shared connection holding the in-memory user_states table"""
+        # User states are short-lived (5 min TTL), so they live in an attached
+        # :memory: database and never touch the WAL or fsync
+        conn = self._connect()
+        conn.execute("ATTACH DATABASE ':memory:' AS eph")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS eph.user_states (
+                user_id INTEGER PRIMARY KEY,
+                state TEXT,
+                timestamp REAL
+            )
+        ''')
+        conn.commit()
+        return conn
+    
+    def _migrate_allowed_user_ids(self, conn: sqlite3.Connection):
+        """Rewrite JSON allowed_user_ids values from older versions as comma-separated IDs"""
+        cursor = conn.execute('''
+            UPDATE channel_subscriptions
+            SET allowed_user_ids = COALESCE(
+                (SELECT group_concat(value, ',') FROM json_each(allowed_user_ids)), ''
+            )
+            WHERE (allowed_user_ids LIKE '[%' OR allowed_user_ids LIKE '{%')
+              AND json_valid(allowed_user_ids)
+        ''')
+        if cursor.rowcount > 0:
+            logger.info(f"🔧 Converted {cursor.rowcount} allowed_user_ids values from JSON")
+    
+    async def _run_write(self, func, *args, **kwargs):
+        """Run a blocking write method on the dedicated writer thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._write_pool, functools.partial(func, *args, **kwargs))
+
+    async def _run_read(self, func, *args, **kwargs):
+        """Run a blocking read method on the reader pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_pool, functools.partial(func, *args, **kwargs))
+
     def _serialize_json(self, data: Any) -> str:
         """Serialize data to JSON string"""
         if data is None:
             return '{}'
-        return ujson.dumps(data)
-    
-    def _deserialize_json(self, data: str) -> Any:
-        """Deserialize JSON string to data"""
-        if not data:
-            return {}
-        try:
-            return ujson.loads(data)
-        except:
-            return {}
+        # Decode once here so the columns keep TEXT affinity
+        return _json_dumps(data).decode()
     
     # User management methods
     def get_user(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                'SELECT * FROM users WHERE user_id = ?', (user_id,)
-            )
-            row = cursor.fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(
+                f'{_SELECT_USERS} WHERE user_id = ?', (user_id,)
+            ).fetchone()
             if row:
-                return User(
-                    user_id=row['user_id'],
-                    username=row['username'],
-                    first_name=row['first_name'],
-                    last_name=row['last_name'],
-                    settings=self._deserialize_json(row['settings']),
-                    api_key=row['api_key'],
-                    wallet_id=row['wallet_id'],
-                    created_at=row['created_at'],
-                    last_active=row['last_active'],
-                    is_verified=bool(row['is_verified']) if 'is_verified' in row.keys() else False,
-                    verified_at=row['verified_at'] if 'verified_at' in row.keys() else None,
-                    wallet_pattern=row['wallet_pattern'] if 'wallet_pattern' in row.keys() else None
-                )
+                return _materialize_user(row)
             return None
     
+    def get_users(self, user_ids: List[int]) -> Dict[int, User]:
+        """Get several users by ID in one query"""
+        if not user_ids:
+            return {}
+        placeholders = ','.join('?' * len(user_ids))
+        with self._read_conn() as conn:
+            return {
+                user.user_id: user for user in map(_materialize_user, conn.execute(
+                    f'{_SELECT_USERS} WHERE user_id IN ({placeholders})', user_ids
+                ))
+            }
+    
     def create_user(self, user_id: int, **kwargs) -> User:
         """Create or update user"""
         # CRITICAL SAFEGUARD: Reject 'settings' parameter to prevent accidental overwrites
@@ -342,7 +573,7 @@ class SQLiteStorage:
             if 'enabled_chains' not in user.settings:
                 user.settings['enabled_chains'] = ['solana', 'bsc', 'ethereum', 'base', 'tron']
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_txn() as conn:
                 conn.execute('''
                     UPDATE users SET 
                     username=?, first_name=?, last_name=?, settings=?, 
@@ -359,11 +590,10 @@ class SQLiteStorage:
                 logger.debug(f"💾 Updated user {user_id} in database")
         else:
             # Create new user with default settings
-            from config import DEFAULT_SETTINGS
-            new_user_settings = DEFAULT_SETTINGS.copy()
+            new_user_settings = _clone_defaults()
             
             user = User(user_id=user_id, settings=new_user_settings, **kwargs)
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_txn() as conn:
                 conn.execute('''
                     INSERT INTO users 
                     (user_id, username, first_name, last_name, settings, 
@@ -388,7 +618,7 @@ class SQLiteStorage:
             user.set_setting(key, value)
             user.update_activity()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_txn() as conn:
                 conn.execute(
                     'UPDATE users SET settings=?, last_active=? WHERE user_id=?',
                     (self._serialize_json(user.settings), user.last_active, user_id)
@@ -400,9 +630,10 @@ class SQLiteStorage:
         user = self.get_user(user_id)
         if user:
             user.settings = settings.copy()
+            user._refresh_setting_cache()
             user.update_activity()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_txn() as conn:
                 conn.execute(
                     'UPDATE users SET settings=?, last_active=? WHERE user_id=?',
                     (self._serialize_json(user.settings), user.last_active, user_id)
@@ -421,7 +652,7 @@ class SQLiteStorage:
         """Create a new trade order"""
         order = TradeOrder(order_id=order_id, user_id=user_id, **kwargs)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write_txn(bump=False) as conn:
             conn.execute('''
                 INSERT INTO orders 
                 (order_id, user_id, chain, pair, order_type, amount, status, 
@@ -439,164 +670,153 @@ class SQLiteStorage:
     
     def get_order(self, order_id: str) -> Optional[TradeOrder]:
         """Get order by ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                'SELECT * FROM orders WHERE order_id = ?', (order_id,)
-            )
-            row = cursor.fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(
+                f'{_SELECT_ORDERS} WHERE order_id = ?', (order_id,)
+            ).fetchone()
             if row:
-                return TradeOrder(
-                    order_id=row['order_id'],
-                    user_id=row['user_id'],
-                    chain=row['chain'],
-                    pair=row['pair'],
-                    order_type=row['order_type'],
-                    amount=row['amount'],
-                    status=row['status'],
-                    created_at=row['created_at'],
-                    completed_at=row['completed_at'],
-                    error_message=row['error_message'],
-                    settings=self._deserialize_json(row['settings'])
-                )
+                return _materialize_order(row)
             return None
     
     def get_user_orders(self, user_id: int, limit: int = 10) -> List[TradeOrder]:
         """Get recent orders for user"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT * FROM orders WHERE user_id = ? 
+        with self._read_conn() as conn:
+            cursor = conn.execute(f'''
+                {_SELECT_ORDERS} WHERE user_id = ? 
                 ORDER BY created_at DESC LIMIT ?
             ''', (user_id, limit))
-            
-            orders = []
-            for row in cursor.fetchall():
-                orders.append(TradeOrder(
-                    order_id=row['order_id'],
-                    user_id=row['user_id'],
-                    chain=row['chain'],
-                    pair=row['pair'],
-                    order_type=row['order_type'],
-                    amount=row['amount'],
-                    status=row['status'],
-                    created_at=row['created_at'],
-                    completed_at=row['completed_at'],
-                    error_message=row['error_message'],
-                    settings=self._deserialize_json(row['settings'])
-                ))
-            return orders
+            return [_materialize_order(row) for row in cursor]
     
     def update_order_status(self, order_id: str, status: str, error: Optional[str] = None):
         """Update order status"""
-        completed_at = time.time() if status in ['completed', 'failed'] else None
+        completed_at = _now() if status in ['completed', 'failed'] else None
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write_txn(bump=False) as conn:
             conn.execute('''
                 UPDATE orders SET status=?, completed_at=?, error_message=?
                 WHERE order_id=?
             ''', (status, completed_at, error, order_id))
             conn.commit()
     
+    def write_order_batch(self, orders: List[TradeOrder], updates: List[tuple]):
+        """Insert new orders, then apply (order_id, status, error) updates, in one transaction
+
+        If the batch fails (e.g. a duplicate order_id), it is retried row by row so
+        one bad row cannot discard the other orders in the batch.
+        """
+        try:
+            self._write_order_rows(orders, updates)
+        except sqlite3.Error as e:
+            if len(orders) + len(updates) <= 1:
+                raise
+            logger.warning(f"⚠️ Order batch failed ({e}), retrying {len(orders) + len(updates)} rows one by one")
+            for order in orders:
+                try:
+                    self._write_order_rows([order], [])
+                except sqlite3.Error as row_error:
+                    logger.error(f"❌ Dropped order {order.order_id}: {row_error}")
+            for update in updates:
+                try:
+                    self._write_order_rows([], [update])
+                except sqlite3.Error as row_error:
+                    logger.error(f"❌ Dropped status update for order {update[0]}: {row_error}")
+    
+    def _write_order_rows(self, orders: List[TradeOrder], updates: List[tuple]):
+        """Write orders and status updates in a single transaction (all or nothing)"""
+        now = _now()
+        with self._write_txn(bump=False) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if orders:
+                conn.executemany('''
+                    INSERT INTO orders 
+                    (order_id, user_id, chain, pair, order_type, amount, status, 
+                     created_at, completed_at, error_message, settings)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(
+                    order.order_id, order.user_id, order.chain, order.pair,
+                    order.order_type, order.amount, order.status, order.created_at,
+                    order.completed_at, order.error_message,
+                    self._serialize_json(order.settings)
+                ) for order in orders])
+            if updates:
+                conn.executemany('''
+                    UPDATE orders SET status=?, completed_at=?, error_message=?
+                    WHERE order_id=?
+                ''', [(
+                    status, now if status in ['completed', 'failed'] else None, error, order_id
+                ) for order_id, status, error in updates])
+            conn.commit()
+    
     # Channel management methods
     def create_channel_subscription(self, user_id: int, channel_id: int, 
                                   channel_title: str, **kwargs) -> ChannelSubscription:
         """Create or update channel subscription"""
-        existing = self.get_channel_subscription(user_id, channel_id)
-        
-        if existing:
-            # Update existing subscription
-            for key, value in kwargs.items():
-                if hasattr(existing, key):
-                    setattr(existing, key, value)
-            subscription = existing
-        else:
-            # Create new subscription
-            subscription = ChannelSubscription(
-                channel_id=channel_id,
-                user_id=user_id,
-                channel_title=channel_title,
-                **kwargs
-            )
+        subscription = ChannelSubscription(
+            channel_id=channel_id,
+            user_id=user_id,
+            channel_title=channel_title,
+            **kwargs
+        )
+        # On conflict only overwrite the title and the fields the caller passed,
+        # so created_at, total_trades etc. survive re-subscribing
+        update_columns = ['channel_title'] + [key for key in kwargs if key in self._CHANNEL_UPSERT_COLUMNS]
+        update_clause = ', '.join(f'{column}=excluded.{column}' for column in update_columns)
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT OR REPLACE INTO channel_subscriptions 
+        with self._write_txn() as conn:
+            conn.execute(f'''
+                INSERT INTO channel_subscriptions 
                 (channel_id, user_id, channel_title, channel_username, channel_type,
                  is_active, filter_mode, allowed_user_ids, custom_buy_amount,
                  created_at, last_message_at, total_trades)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(channel_id, user_id) DO UPDATE SET {update_clause}
             ''', (
                 subscription.channel_id, subscription.user_id, subscription.channel_title,
                 subscription.channel_username, subscription.channel_type.value,
                 subscription.is_active, subscription.filter_mode.value,
-                self._serialize_json(subscription.allowed_user_ids),
+                _encode_user_ids(subscription.allowed_user_ids),
                 subscription.custom_buy_amount, subscription.created_at,
                 subscription.last_message_at, subscription.total_trades
             ))
             conn.commit()
+            
+            # Return the merged row, which may differ from the defaults above
+            row = conn.execute(
+                f'{_SELECT_CHANNELS} WHERE user_id = ? AND channel_id = ?',
+                (user_id, channel_id)
+            ).fetchone()
         
-        return subscription
+        return _materialize_subscription(row)
     
     def get_channel_subscription(self, user_id: int, channel_id: int) -> Optional[ChannelSubscription]:
         """Get specific channel subscription"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute(
-                'SELECT * FROM channel_subscriptions WHERE user_id = ? AND channel_id = ?',
+                f'{_SELECT_CHANNELS} WHERE user_id = ? AND channel_id = ?',
                 (user_id, channel_id)
             )
             row = cursor.fetchone()
             if row:
-                return ChannelSubscription(
-                    channel_id=row['channel_id'],
-                    user_id=row['user_id'],
-                    channel_title=row['channel_title'],
-                    channel_username=row['channel_username'],
-                    channel_type=ChannelType(row['channel_type']),
-                    is_active=bool(row['is_active']),
-                    filter_mode=FilterMode(row['filter_mode']),
-                    allowed_user_ids=self._deserialize_json(row['allowed_user_ids']),
-                    custom_buy_amount=row['custom_buy_amount'],
-                    created_at=row['created_at'],
-                    last_message_at=row['last_message_at'],
-                    total_trades=row['total_trades']
-                )
+                return _materialize_subscription(row)
             return None
     
     def get_user_channels(self, user_id: int) -> List[ChannelSubscription]:
         """Get all channel subscriptions for user"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                'SELECT * FROM channel_subscriptions WHERE user_id = ?', (user_id,)
-            )
-            
-            channels = []
-            for row in cursor.fetchall():
-                channels.append(ChannelSubscription(
-                    channel_id=row['channel_id'],
-                    user_id=row['user_id'],
-                    channel_title=row['channel_title'],
-                    channel_username=row['channel_username'],
-                    channel_type=ChannelType(row['channel_type']),
-                    is_active=bool(row['is_active']),
-                    filter_mode=FilterMode(row['filter_mode']),
-                    allowed_user_ids=self._deserialize_json(row['allowed_user_ids']),
-                    custom_buy_amount=row['custom_buy_amount'],
-                    created_at=row['created_at'],
-                    last_message_at=row['last_message_at'],
-                    total_trades=row['total_trades']
-                ))
-            return channels
+        return self._query_subscriptions('user_id = ?', (user_id,))
     
     def get_active_channels(self, user_id: int) -> List[ChannelSubscription]:
         """Get active channel subscriptions for user"""
-        return [ch for ch in self.get_user_channels(user_id) if ch.is_active]
+        return self._query_subscriptions('user_id = ? AND is_active = 1', (user_id,))
+    
+    def _query_subscriptions(self, where: str, params: tuple = ()) -> List[ChannelSubscription]:
+        """Stream matching channel_subscriptions rows through the materializer"""
+        with self._read_conn() as conn:
+            cursor = conn.execute(f'{_SELECT_CHANNELS} WHERE {where}', params)
+            return list(map(_materialize_subscription, cursor))
     
     def remove_channel_subscription(self, user_id: int, channel_id: int) -> bool:
         """Remove channel subscription"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write_txn() as conn:
             cursor = conn.execute(
                 'DELETE FROM channel_subscriptions WHERE user_id = ? AND channel_id = ?',
                 (user_id, channel_id)
@@ -607,28 +827,27 @@ class SQLiteStorage:
     # User state management
     def set_user_state(self, user_id: int, state: str):
         """Set user state for multi-step operations"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT OR REPLACE INTO user_states (user_id, state, timestamp)
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO eph.user_states (user_id, state, timestamp)
                 VALUES (?, ?, ?)
-            ''', (user_id, state, time.time()))
-            conn.commit()
+            ''', (user_id, state, _now()))
+            self._conn.commit()
     
     def get_user_state(self, user_id: int) -> Optional[str]:
         """Get user state"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                'SELECT * FROM user_states WHERE user_id = ?', (user_id,)
-            )
-            row = cursor.fetchone()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT state, timestamp FROM eph.user_states WHERE user_id = ?', (user_id,)
+            ).fetchone()
             if row:
+                state, timestamp = row
                 # Clear old states (older than 5 minutes)
-                if time.time() - row['timestamp'] > 300:
-                    conn.execute('DELETE FROM user_states WHERE user_id = ?', (user_id,))
-                    conn.commit()
+                if _now() - timestamp > 300:
+                    self._conn.execute('DELETE FROM eph.user_states WHERE user_id = ?', (user_id,))
+                    self._conn.commit()
                     return None
-                return row['state']
+                return state
             return None
     
     def is_awaiting_channel_forward(self, user_id: int) -> bool:
@@ -637,16 +856,16 @@ class SQLiteStorage:
     
     def clear_user_state(self, user_id: int):
         """Clear user state"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('DELETE FROM user_states WHERE user_id = ?', (user_id,))
-            conn.commit()
+        with self._lock:
+            self._conn.execute('DELETE FROM eph.user_states WHERE user_id = ?', (user_id,))
+            self._conn.commit()
     
     def toggle_channel(self, user_id: int, channel_id: int) -> Optional[bool]:
         """Toggle channel active status, returns new status"""
         subscription = self.get_channel_subscription(user_id, channel_id)
         if subscription:
             new_status = not subscription.is_active
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_txn() as conn:
                 conn.execute(
                     'UPDATE channel_subscriptions SET is_active = ? WHERE user_id = ? AND channel_id = ?',
                     (new_status, user_id, channel_id)
@@ -657,7 +876,7 @@ class SQLiteStorage:
     
     def update_channel_subscription(self, channel_sub: ChannelSubscription):
         """Update channel subscription using ChannelSubscription object"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write_txn() as conn:
             conn.execute('''
                 UPDATE channel_subscriptions SET 
                 channel_title=?, channel_username=?, channel_type=?, is_active=?,
@@ -668,7 +887,7 @@ class SQLiteStorage:
                 channel_sub.channel_title, channel_sub.channel_username,
                 channel_sub.channel_type.value, channel_sub.is_active,
                 channel_sub.filter_mode.value, 
-                self._serialize_json(channel_sub.allowed_user_ids),
+                _encode_user_ids(channel_sub.allowed_user_ids),
                 channel_sub.custom_buy_amount, channel_sub.last_message_at,
                 channel_sub.total_trades, channel_sub.user_id, channel_sub.channel_id
             ))
@@ -684,7 +903,7 @@ class SQLiteStorage:
                     setattr(subscription, key, value)
             
             # Save to database
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_txn() as conn:
                 conn.execute('''
                     UPDATE channel_subscriptions SET 
                     channel_title=?, channel_username=?, channel_type=?, is_active=?,
@@ -695,7 +914,7 @@ class SQLiteStorage:
                     subscription.channel_title, subscription.channel_username,
                     subscription.channel_type.value, subscription.is_active,
                     subscription.filter_mode.value, 
-                    self._serialize_json(subscription.allowed_user_ids),
+                    _encode_user_ids(subscription.allowed_user_ids),
                     subscription.custom_buy_amount, subscription.last_message_at,
                     subscription.total_trades, user_id, channel_id
                 ))
@@ -705,82 +924,169 @@ class SQLiteStorage:
         """Update tracked user list for specific users monitoring mode"""
         subscription = self.get_channel_subscription(user_id, channel_id)
         if subscription:
-            subscription.allowed_user_ids = user_ids.copy()
+            subscription.allowed_user_ids = frozenset(user_ids)
             subscription.filter_mode = FilterMode.SPECIFIC_USERS
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_txn() as conn:
                 conn.execute('''
                     UPDATE channel_subscriptions SET 
                     filter_mode=?, allowed_user_ids=?
                     WHERE user_id=? AND channel_id=?
                 ''', (
                     subscription.filter_mode.value,
-                    self._serialize_json(subscription.allowed_user_ids),
+                    _encode_user_ids(subscription.allowed_user_ids),
                     user_id, channel_id
                 ))
                 conn.commit()
             return True
         return False
     
+    def _data_version(self) -> int:
+        """Counter that changes whenever another connection commits"""
+        with self._lock:
+            return self._conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def change_version(self) -> tuple:
+        """Opaque stamp that changes whenever this or any other connection commits"""
+        # data_version only moves for other connections' commits
+        return (self._data_version(), self._write_seq)
+    
+    def _get_active_cache(self) -> Dict[str, Any]:
+        """Return the active-channel cache, rebuilding it if the database changed"""
+        version = self.change_version()
+        cache = self._active_cache
+        if cache is not None and cache['version'] == version:
+            return cache
+        
+        subscriptions = tuple(self._query_subscriptions('is_active = 1'))
+        
+        # channel_id column plus an index over it, so dispatch is one dict probe
+        channel_ids = tuple(sub.channel_id for sub in subscriptions)
+        by_channel: Dict[int, List[int]] = {}
+        for index, channel_id in enumerate(channel_ids):
+            by_channel.setdefault(channel_id, []).append(index)
+        
+        cache = {
+            'version': version,
+            'subscriptions': subscriptions,
+            'channel_ids': channel_ids,
+            'by_channel': by_channel
+        }
+        self._active_cache = cache
+        return cache
+    
     def get_all_active_channels(self) -> List[ChannelSubscription]:
         """Get all active channels across all users (for real-time monitor)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                'SELECT * FROM channel_subscriptions WHERE is_active = 1'
-            )
-            
-            channels = []
-            for row in cursor.fetchall():
-                channels.append(ChannelSubscription(
-                    channel_id=row['channel_id'],
-                    user_id=row['user_id'],
-                    channel_title=row['channel_title'],
-                    channel_username=row['channel_username'],
-                    channel_type=ChannelType(row['channel_type']),
-                    is_active=bool(row['is_active']),
-                    filter_mode=FilterMode(row['filter_mode']),
-                    allowed_user_ids=self._deserialize_json(row['allowed_user_ids']),
-                    custom_buy_amount=row['custom_buy_amount'],
-                    created_at=row['created_at'],
-                    last_message_at=row['last_message_at'],
-                    total_trades=row['total_trades']
-                ))
-            return channels
+        return list(self._get_active_cache()['subscriptions'])
+    
+    def get_active_subscriptions(self, channel_id: int) -> List[ChannelSubscription]:
+        """Get active subscriptions for one channel from the dispatch cache"""
+        cache = self._get_active_cache()
+        subscriptions = cache['subscriptions']
+        return [subscriptions[index] for index in cache['by_channel'].get(channel_id, ())]
+    
+    def get_active_channels_grouped(self) -> Dict[int, List[ChannelSubscription]]:
+        """Get all active subscriptions grouped by channel_id in one pass"""
+        with self._read_conn() as conn:
+            cursor = conn.execute(f'{_SELECT_CHANNELS} WHERE is_active = 1 ORDER BY channel_id')
+            return {
+                channel_id: list(map(_materialize_subscription, rows))
+                for channel_id, rows in itertools.groupby(cursor, key=operator.itemgetter(0))
+            }
     
     def get_all_user_channels_by_channel_id(self, channel_id: int) -> List[ChannelSubscription]:
         """Get all user subscriptions for a specific channel ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                'SELECT * FROM channel_subscriptions WHERE channel_id = ? AND is_active = 1',
-                (channel_id,)
+        return self._query_subscriptions('channel_id = ? AND is_active = 1', (channel_id,))
+    
+    # Channel metric write-back
+    def bump_channel(self, channel_id: int, user_id: int):
+        """Count a trade for a channel; written to the database by the metrics flusher"""
+        key = (channel_id, user_id)
+        trades, _ = self._pending_metrics.get(key, (0, 0.0))
+        self._pending_metrics[key] = (trades + 1, _now())
+        
+        if self._metrics_task is None or self._metrics_task.done():
+            self._metrics_task = asyncio.get_running_loop().create_task(self._flush_metrics_loop())
+    
+    def _write_channel_metrics(self, pending: Dict[tuple, tuple]):
+        """Apply coalesced trade counters in one executemany"""
+        # Counters only: leave change_version() alone so a trade doesn't force
+        # the monitor to reload every subscription and user
+        with self._write_txn(bump=False) as conn:
+            conn.executemany(
+                'UPDATE channel_subscriptions SET total_trades = total_trades + ?, last_message_at = ? '
+                'WHERE channel_id = ? AND user_id = ?',
+                [(trades, last_at, channel_id, user_id)
+                 for (channel_id, user_id), (trades, last_at) in pending.items()]
             )
-            
-            channels = []
-            for row in cursor.fetchall():
-                channels.append(ChannelSubscription(
-                    channel_id=row['channel_id'],
-                    user_id=row['user_id'],
-                    channel_title=row['channel_title'],
-                    channel_username=row['channel_username'],
-                    channel_type=ChannelType(row['channel_type']),
-                    is_active=bool(row['is_active']),
-                    filter_mode=FilterMode(row['filter_mode']),
-                    allowed_user_ids=self._deserialize_json(row['allowed_user_ids']),
-                    custom_buy_amount=row['custom_buy_amount'],
-                    created_at=row['created_at'],
-                    last_message_at=row['last_message_at'],
-                    total_trades=row['total_trades']
-                ))
-            return channels
+            conn.commit()
+    
+    async def _flush_metrics_loop(self, interval: float = 0.5):
+        """Drain pending channel metrics every interval until nothing is left"""
+        while self._pending_metrics:
+            await asyncio.sleep(interval)
+            pending, self._pending_metrics = self._pending_metrics, {}
+            try:
+                await self._run_write(self._write_channel_metrics, pending)
+            except Exception as e:
+                logger.error(f"❌ Failed to flush channel metrics: {e}")
+    
+    def flush_channel_metrics(self):
+        """Write any pending channel metrics immediately (call on shutdown)"""
+        pending, self._pending_metrics = self._pending_metrics, {}
+        if pending:
+            self._write_channel_metrics(pending)
+    
+    # Order write-behind
+    def queue_order(self, order: TradeOrder):
+        """Queue a new order; written to the database by the order writer"""
+        self._pending_order_ops.append(order)
+        self._start_order_writer()
+    
+    def queue_order_status(self, order_id: str, status: str, error_message: Optional[str] = None):
+        """Queue an order status update; written to the database by the order writer"""
+        self._pending_order_ops.append((order_id, status, error_message))
+        self._start_order_writer()
+    
+    def _start_order_writer(self):
+        if self._order_writer_task is None or self._order_writer_task.done():
+            self._order_writer_task = asyncio.get_running_loop().create_task(self._order_writer_loop())
+    
+    async def _order_writer_loop(self, batch_size: int = 256):
+        """Write queued order ops in FIFO batches until none are left
+
+        Ops queued while a batch is being written go into the next batch, so a
+        burst of trades costs one transaction instead of one per write.
+        """
+        while self._pending_order_ops:
+            ops = self._pending_order_ops[:batch_size]
+            del self._pending_order_ops[:batch_size]
+            # FIFO batches keep every update in the same or a later batch than its insert
+            orders = [op for op in ops if isinstance(op, TradeOrder)]
+            updates = [op for op in ops if not isinstance(op, TradeOrder)]
+            try:
+                await self._run_write(self.write_order_batch, orders, updates)
+            except Exception as e:
+                logger.error(f"❌ Failed to write {len(ops)} queued order ops: {e}")
+    
+    async def a_flush_order_writes(self, timeout: float = 5.0):
+        """Wait for queued order writes to reach the database (call on shutdown)"""
+        task = self._order_writer_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Timed out flushing queued order writes")
     
     def get_stats(self) -> Dict[str, int]:
         """Get storage statistics"""
-        with sqlite3.connect(self.db_path) as conn:
-            users_count = conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
-            channels_count = conn.execute('SELECT COUNT(*) FROM channel_subscriptions').fetchone()[0]
-            orders_count = conn.execute('SELECT COUNT(*) FROM orders').fetchone()[0]
+        with self._read_conn() as conn:
+            users_count, channels_count, orders_count = conn.execute(
+                'SELECT (SELECT COUNT(*) FROM users), '
+                '(SELECT COUNT(*) FROM channel_subscriptions), '
+                '(SELECT COUNT(*) FROM orders)'
+            ).fetchone()
             
             return {
                 'users': users_count,
@@ -788,6 +1094,11 @@ class SQLiteStorage:
                 'orders': orders_count
             }
     
+    def _rows_as_dicts(self, cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+        """Convert tuple rows to dicts using the cursor's column names"""
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+    
     def export_data(self) -> Dict[str, Any]:
         """Export all data for backup"""
         data = {
@@ -797,99 +1108,197 @@ class SQLiteStorage:
             'user_states': []
         }
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
+        with self._read_conn() as conn:
             # Export users
-            for row in conn.execute('SELECT * FROM users'):
-                data['users'].append(dict(row))
+            data['users'] = self._rows_as_dicts(conn.execute('SELECT * FROM users'))
             
             # Export orders
-            for row in conn.execute('SELECT * FROM orders'):
-                data['orders'].append(dict(row))
+            data['orders'] = self._rows_as_dicts(conn.execute('SELECT * FROM orders'))
             
             # Export channel subscriptions
-            for row in conn.execute('SELECT * FROM channel_subscriptions'):
-                data['channel_subscriptions'].append(dict(row))
-            
-            # Export user states
-            for row in conn.execute('SELECT * FROM user_states'):
-                data['user_states'].append(dict(row))
+            data['channel_subscriptions'] = self._rows_as_dicts(
+                conn.execute('SELECT * FROM channel_subscriptions')
+            )
+        
+        # Export user states
+        with self._lock:
+            data['user_states'] = self._rows_as_dicts(self._conn.execute('SELECT * FROM eph.user_states'))
         
         return data
     
+    def _write_rows_ndjson(self, out, table: str, cursor: sqlite3.Cursor) -> int:
+        """Write each cursor row as one {"table", "row"} JSON line"""
+        names = [column[0] for column in cursor.description]
+        count = 0
+        for row in cursor:
+            out.write(_json_dumps({'table': table, 'row': dict(zip(names, row))}))
+            out.write(b'\n')
+            count += 1
+        return count
+    
+    def export_data_stream(self, path: str) -> int:
+        """Stream all data to a JSON-lines backup file without building it in memory"""
+        count = 0
+        with open(path, 'wb', buffering=1 << 20) as out:
+            with self._read_conn() as conn:
+                for table in ('users', 'orders', 'channel_subscriptions'):
+                    count += self._write_rows_ndjson(out, table, conn.execute(f'SELECT * FROM {table}'))
+            
+            with self._lock:
+                count += self._write_rows_ndjson(
+                    out, 'user_states', self._conn.execute('SELECT * FROM eph.user_states')
+                )
+        
+        logger.info(f"💾 Exported {count} rows to {path}")
+        return count
+    
+    def backup_to(self, path: str):
+        """Copy the database to path with SQLite's online backup API (user states are not included)"""
+        src = self._connect()
+        dst = sqlite3.connect(path)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        logger.info(f"💾 Database backed up to {path}")
+    
+    def restore_from(self, path: str):
+        """Replace the database contents with a backup made by backup_to"""
+        src = sqlite3.connect(path)
+        try:
+            with self._write_txn() as conn:
+                src.backup(conn)
+        finally:
+            src.close()
+        
+        # Backups from older versions may predate current columns and tables
+        self._initialize_database()
+        logger.info(f"♻️ Database restored from {path}")
+    
     def import_data(self, data: Dict[str, Any]):
         """Import data from backup"""
-        with sqlite3.connect(self.db_path) as conn:
+        users = data.get('users', [])
+        orders = data.get('orders', [])
+        channels = data.get('channel_subscriptions', [])
+        states = data.get('user_states', [])
+        
+        with self._write_txn() as conn:
+            # One IMMEDIATE transaction (main + eph) so a restore is a single commit
+            conn.execute('BEGIN IMMEDIATE')
+            
             # Clear existing data
-            conn.execute('DELETE FROM user_states')
+            conn.execute('DELETE FROM eph.user_states')
             conn.execute('DELETE FROM channel_subscriptions')
             conn.execute('DELETE FROM orders')
             conn.execute('DELETE FROM users')
             
             # Import users
-            if 'users' in data:
-                for user_data in data['users']:
-                    conn.execute('''
-                        INSERT INTO users 
-                        (user_id, username, first_name, last_name, settings, 
-                         api_key, wallet_id, created_at, last_active)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        user_data['user_id'], user_data['username'], 
-                        user_data['first_name'], user_data['last_name'],
-                        user_data['settings'], user_data['api_key'],
-                        user_data['wallet_id'], user_data['created_at'],
-                        user_data['last_active']
-                    ))
+            conn.executemany('''
+                INSERT INTO users 
+                (user_id, username, first_name, last_name, settings, 
+                 api_key, wallet_id, created_at, last_active)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                user_data['user_id'], user_data['username'], 
+                user_data['first_name'], user_data['last_name'],
+                user_data['settings'], user_data['api_key'],
+                user_data['wallet_id'], user_data['created_at'],
+                user_data['last_active']
+            ) for user_data in users])
             
             # Import orders
-            if 'orders' in data:
-                for order_data in data['orders']:
-                    conn.execute('''
-                        INSERT INTO orders 
-                        (order_id, user_id, chain, pair, order_type, amount, status, 
-                         created_at, completed_at, error_message, settings)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        order_data['order_id'], order_data['user_id'],
-                        order_data['chain'], order_data['pair'],
-                        order_data['order_type'], order_data['amount'],
-                        order_data['status'], order_data['created_at'],
-                        order_data['completed_at'], order_data['error_message'],
-                        order_data['settings']
-                    ))
+            conn.executemany('''
+                INSERT INTO orders 
+                (order_id, user_id, chain, pair, order_type, amount, status, 
+                 created_at, completed_at, error_message, settings)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                order_data['order_id'], order_data['user_id'],
+                order_data['chain'], order_data['pair'],
+                order_data['order_type'], order_data['amount'],
+                order_data['status'], order_data['created_at'],
+                order_data['completed_at'], order_data['error_message'],
+                order_data['settings']
+            ) for order_data in orders])
             
             # Import channel subscriptions
-            if 'channel_subscriptions' in data:
-                for ch_data in data['channel_subscriptions']:
-                    conn.execute('''
-                        INSERT INTO channel_subscriptions 
-                        (channel_id, user_id, channel_title, channel_username, 
-                         channel_type, is_active, filter_mode, allowed_user_ids,
-                         custom_buy_amount, created_at, last_message_at, total_trades)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        ch_data['channel_id'], ch_data['user_id'],
-                        ch_data['channel_title'], ch_data['channel_username'],
-                        ch_data['channel_type'], ch_data['is_active'],
-                        ch_data['filter_mode'], ch_data['allowed_user_ids'],
-                        ch_data['custom_buy_amount'], ch_data['created_at'],
-                        ch_data['last_message_at'], ch_data['total_trades']
-                    ))
+            conn.executemany('''
+                INSERT INTO channel_subscriptions 
+                (channel_id, user_id, channel_title, channel_username, 
+                 channel_type, is_active, filter_mode, allowed_user_ids,
+                 custom_buy_amount, created_at, last_message_at, total_trades)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                ch_data['channel_id'], ch_data['user_id'],
+                ch_data['channel_title'], ch_data['channel_username'],
+                ch_data['channel_type'], ch_data['is_active'],
+                ch_data['filter_mode'], _encode_user_ids(_decode_user_ids(ch_data['allowed_user_ids'])),
+                ch_data['custom_buy_amount'], ch_data['created_at'],
+                ch_data['last_message_at'], ch_data['total_trades']
+            ) for ch_data in channels])
             
             # Import user states
-            if 'user_states' in data:
-                for state_data in data['user_states']:
-                    conn.execute('''
-                        INSERT INTO user_states (user_id, state, timestamp)
-                        VALUES (?, ?, ?)
-                    ''', (
-                        state_data['user_id'], state_data['state'],
-                        state_data['timestamp']
-                    ))
-            
-            conn.commit()
+            conn.executemany('''
+                INSERT INTO eph.user_states (user_id, state, timestamp)
+                VALUES (?, ?, ?)
+            ''', [(
+                state_data['user_id'], state_data['state'],
+                state_data['timestamp']
+            ) for state_data in states])
+
+    # Async wrappers - keep the event loop free while SQLite blocks
+    async def a_get_user(self, user_id: int) -> Optional[User]:
+        """Async version of get_user"""
+        return await self._run_read(self.get_user, user_id)
+
+    async def a_get_users(self, user_ids: List[int]) -> Dict[int, User]:
+        """Async version of get_users"""
+        return await self._run_read(self.get_users, user_ids)
+
+    async def a_create_user(self, user_id: int, **kwargs) -> User:
+        """Async version of create_user"""
+        return await self._run_write(self.create_user, user_id, **kwargs)
+
+    async def a_create_order(self, order_id: str, user_id: int, **kwargs) -> TradeOrder:
+        """Async version of create_order"""
+        return await self._run_write(self.create_order, order_id, user_id, **kwargs)
+
+    async def a_update_order_status(self, order_id: str, status: str, error: Optional[str] = None):
+        """Async version of update_order_status"""
+        return await self._run_write(self.update_order_status, order_id, status, error)
+
+    async def a_write_order_batch(self, orders: List[TradeOrder], updates: List[tuple]):
+        """Async version of write_order_batch"""
+        return await self._run_write(self.write_order_batch, orders, updates)
+
+    async def a_get_channel_subscription(self, user_id: int, channel_id: int) -> Optional[ChannelSubscription]:
+        """Async version of get_channel_subscription"""
+        return await self._run_read(self.get_channel_subscription, user_id, channel_id)
+
+    async def a_change_version(self) -> tuple:
+        """Async version of change_version"""
+        return await self._run_read(self.change_version)
+    
+    async def a_get_all_active_channels(self) -> List[ChannelSubscription]:
+        """Async version of get_all_active_channels"""
+        return await self._run_read(self.get_all_active_channels)
+
+    async def a_get_active_channels_grouped(self) -> Dict[int, List[ChannelSubscription]]:
+        """Async version of get_active_channels_grouped"""
+        return await self._run_read(self.get_active_channels_grouped)
+
+    async def a_get_active_subscriptions(self, channel_id: int) -> List[ChannelSubscription]:
+        """Async version of get_active_subscriptions"""
+        return await self._run_read(self.get_active_subscriptions, channel_id)
+
+    async def a_update_channel_subscription(self, channel_sub: ChannelSubscription):
+        """Async version of update_channel_subscription"""
+        return await self._run_write(self.update_channel_subscription, channel_sub)
+
+    async def a_remove_channel_subscription(self, user_id: int, channel_id: int) -> bool:
+        """Async version of remove_channel_subscription"""
+        return await self._run_write(self.remove_channel_subscription, user_id, channel_id)
 
 
 # Global storage instance - initialize with SQLite storage immediately
@@ -6,20 +6,20 @@ Direct MTProto connection for 275ms trade execution
 
 import asyncio
 import logging
-import signal
 import sys
 import time
+from types import MappingProxyType
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from telethon import TelegramClient, events
-from telethon.tl.types import Message
+from telethon.tl.types import Message, ChannelParticipantsAdmins, PeerChannel, PeerChat
 from telethon.errors import SessionPasswordNeededError, ApiIdInvalidError
 
 # Import existing components
 from config import API_ID, API_HASH
-from models import storage, ChannelSubscription, FilterMode
+from models import storage, ChannelSubscription, FilterMode, TradeOrder, User
 from api_client import client as dbotx_client
-from utils import detect_contract_address, generate_order_id, PerformanceTimer
+from utils import detect_contract_address, generate_order_id, install_shutdown_handlers, PerformanceTimer
 from config import config
 
 # Configure logging
@@ -47,6 +47,18 @@ class MTProtoScraper:
         self.running = False
         self.monitored_channels: Dict[int, List[ChannelSubscription]] = {}
         self.last_update = time.time()
+        # channel_id -> expiry of a successful validation, so ticks skip resolved channels
+        self._validated: Dict[int, float] = {}
+        # Dialog entity IDs, fetched at most once per channel-list update
+        self._dialog_ids: Optional[Set[int]] = None
+        self._dialog_lock = asyncio.Lock()
+        # channel_id -> (expiry, admin user IDs) for ADMIN_ONLY filtering
+        self._admin_cache: Dict[int, Tuple[float, Set[int]]] = {}
+        # Outbound trade notifications, coalesced per user by _notify_worker
+        self._notify_queue: Optional[asyncio.Queue] = None
+        self._notify_task: Optional[asyncio.Task] = None
+        # Strong references to in-flight sends so they aren't garbage collected
+        self._send_tasks: Set[asyncio.Task] = set()
 
     async def initialize(self):
         """Initialize MTProto client and authenticate"""
@@ -79,6 +91,10 @@ class MTProtoScraper:
         # Initialize DBOTX API client
         await dbotx_client.start_session()
 
+        # Start background notification sender
+        self._notify_queue = asyncio.Queue()
+        self._notify_task = asyncio.create_task(self._notify_worker())
+
         logger.info("✅ MTProto Scraper initialized successfully")
 
     async def _authenticate(self):
@@ -135,39 +151,68 @@ class MTProtoScraper:
     async def _update_channel_list(self):
         """Update list of channels to monitor with proper entity resolution"""
         try:
-            # Get all active channels from storage
-            active_channels = storage.get_all_active_channels()
-
-            # Group by channel ID
-            self.monitored_channels.clear()
-            valid_channels = []
-            
-            for subscription in active_channels:
-                channel_id = subscription.channel_id
-                
-                # Skip test/placeholder channels
-                if channel_id == -1001234567890:
-                    logger.warning(f"⚠️ Skipping test channel {channel_id} - removing from database")
-                    storage.remove_channel_subscription(subscription.user_id, channel_id)
-                    continue
-                
-                # Try to resolve channel entity properly
-                if await self._validate_and_cache_channel(channel_id, subscription):
-                    if channel_id not in self.monitored_channels:
-                        self.monitored_channels[channel_id] = []
-                    self.monitored_channels[channel_id].append(subscription)
-                    valid_channels.append(subscription)
+            # Get all active channels from storage, already grouped by channel ID
+            grouped_channels = await storage.a_get_active_channels_grouped()
+
+            monitored_channels: Dict[int, List[ChannelSubscription]] = {}
+            self._dialog_ids = None
+
+            # Skip test/placeholder channels
+            test_subscriptions = grouped_channels.pop(-1001234567890, None)
+            if test_subscriptions:
+                logger.warning("⚠️ Skipping test channel -1001234567890 - removing from database")
+                for subscription in test_subscriptions:
+                    await storage.a_remove_channel_subscription(subscription.user_id, -1001234567890)
+
+            # Resolve channels concurrently, capped to stay clear of FLOOD_WAIT
+            semaphore = asyncio.Semaphore(10)
+            results = await asyncio.gather(*[
+                self._validate_channel_group(channel_id, subscriptions, semaphore)
+                for channel_id, subscriptions in grouped_channels.items()
+            ], return_exceptions=True)
+
+            for (channel_id, subscriptions), is_valid in zip(grouped_channels.items(), results):
+                if isinstance(is_valid, Exception):
+                    # Keep channels whose check itself errored; retry on the next tick
+                    logger.error(f"Error validating channel {channel_id}: {is_valid}")
+                    monitored_channels[channel_id] = list(subscriptions)
+                elif is_valid:
+                    monitored_channels[channel_id] = list(subscriptions)
                 else:
-                    logger.warning(f"⚠️ Channel {channel_id} not accessible - removing subscription")
-                    storage.remove_channel_subscription(subscription.user_id, channel_id)
+                    logger.warning(f"⚠️ Channel {channel_id} not accessible - removing {len(subscriptions)} subscription(s)")
+                    for subscription in subscriptions:
+                        await storage.a_remove_channel_subscription(subscription.user_id, channel_id)
 
+            # Swap in the new map at once so message handlers never see a partial list
+            self.monitored_channels = monitored_channels
             logger.info(f"🔄 Updated channel list: {len(self.monitored_channels)} valid channels")
 
         except Exception as e:
             logger.error(f"Error updating channel list: {e}")
 
+    async def _validate_channel_group(self, channel_id: int, subscriptions: List[ChannelSubscription],
+                                      semaphore: asyncio.Semaphore) -> bool:
+        """Resolve a channel once; any of its subscriptions' usernames may resolve it"""
+        async with semaphore:
+            for subscription in subscriptions:
+                if await self._validate_and_cache_channel(channel_id, subscription):
+                    return True
+            return False
+
     async def _validate_and_cache_channel(self, channel_id: int, subscription: ChannelSubscription) -> bool:
         """Validate and cache channel entity using proper Telegram entity resolution"""
+        if self._validated.get(channel_id, 0) > time.time():
+            return True
+
+        if await self._resolve_channel(channel_id, subscription):
+            self._validated[channel_id] = time.time() + 3600
+            return True
+
+        self._validated.pop(channel_id, None)
+        return False
+
+    async def _resolve_channel(self, channel_id: int, subscription: ChannelSubscription) -> bool:
+        """Try session cache, username, then dialogs to resolve a channel"""
         try:
             # First, try to get the entity from cache (session)
             try:
@@ -189,12 +234,14 @@ class MTProtoScraper:
                 except Exception as e:
                     logger.debug(f"Username resolution failed for {subscription.channel_username}: {e}")
             
-            # Method 2: Check if in dialogs
+            # Method 2: Check if in dialogs (listed once per update, then set lookups)
             try:
-                async for dialog in self.client.iter_dialogs():
-                    if dialog.entity.id == abs(channel_id):
-                        logger.info(f"✅ Channel {channel_id} found in dialogs: {dialog.entity.title}")
-                        return True
+                async with self._dialog_lock:
+                    if self._dialog_ids is None:
+                        self._dialog_ids = {dialog.entity.id async for dialog in self.client.iter_dialogs()}
+                if abs(channel_id) in self._dialog_ids:
+                    logger.info(f"✅ Channel {channel_id} found in dialogs")
+                    return True
             except Exception as e:
                 logger.debug(f"Dialog search failed: {e}")
             
@@ -234,9 +281,6 @@ class MTProtoScraper:
         try:
             message = event.message
 
-            # Import Telethon types for proper type checking
-            from telethon.tl.types import PeerChannel, PeerChat
-
             # Filter out non-channel messages (only process channels and supergroups)
             if not isinstance(message.peer_id, (PeerChannel, PeerChat)):
                 logger.debug("Skipping non-channel message (direct message or other type).")
@@ -251,8 +295,12 @@ class MTProtoScraper:
                 logger.debug("Skipping message - no channel or chat ID found.")
                 return
 
+            # Read the (entity-rendered) text once; each .text access re-renders it
+            text = message.text or ""
+
             # Debug: Log all incoming messages
-            logger.debug(f"📨 New message from channel {channel_id}: {message.text[:100] if message.text else 'No text'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📨 New message from channel {channel_id}: {text[:100] if text else 'No text'}")
 
             # Check if message is from a monitored channel
             if channel_id not in self.monitored_channels:
@@ -263,15 +311,34 @@ class MTProtoScraper:
 
             logger.info(f"📡 Processing message from monitored channel {channel_id} ({len(subscriptions)} subscriptions)")
 
-            # Process message for each subscription
+            # Detect the contract once per message, not once per subscription
+            if not text:
+                return
+
+            with PerformanceTimer("contract_detection"):
+                contract_info = detect_contract_address(text)
+
+            if not contract_info:
+                return  # No contract found
+
+            # Apply each subscription's filters
+            matched: List[ChannelSubscription] = []
             for subscription in subscriptions:
                 logger.debug(f"🔍 Checking message for user {subscription.user_id}")
                 if await self._should_process_message(message, subscription):
                     logger.info(f"✅ Message passed filters for {subscription.channel_title}")
-                    await self._process_token_message(message, subscription)
+                    matched.append(subscription)
                 else:
                     logger.debug(f"❌ Message filtered out for {subscription.channel_title}")
 
+            if not matched:
+                return
+
+            # Load every matched subscriber in one query
+            users = await storage.a_get_users([subscription.user_id for subscription in matched])
+            for subscription in matched:
+                await self._process_token_message(contract_info, subscription, users.get(subscription.user_id))
+
         except Exception as e:
             logger.error(f"Error handling message: {e}")
 
@@ -283,27 +350,21 @@ class MTProtoScraper:
                 return True
 
             elif subscription.filter_mode == FilterMode.ADMIN_ONLY:
-                # Check if sender is admin
-                sender = await message.get_sender()
-                if not sender:
+                # Check if sender is admin (sender_id comes with the update, no RPC)
+                sender_id = message.sender_id
+                if sender_id is None:
                     return False
 
                 # Get channel admins (cached for performance)
                 try:
-                    entity = await self.client.get_entity(subscription.channel_id)
-                    async for participant in self.client.iter_participants(entity, filter=lambda p: p.admin_rights):
-                        if participant.id == sender.id:
-                            return True
-                    return False
+                    return sender_id in await self._get_channel_admins(subscription.channel_id)
                 except:
                     return False
 
             elif subscription.filter_mode == FilterMode.SPECIFIC_USERS:
-                # Check if sender is in allowed list
-                sender = await message.get_sender()
-                if not sender:
-                    return False
-                return sender.id in subscription.allowed_user_ids
+                # Check if sender is in allowed list (frozenset loaded with the subscription)
+                sender_id = message.sender_id
+                return sender_id is not None and sender_id in subscription.allowed_user_ids
 
             return False
 
@@ -311,24 +372,25 @@ class MTProtoScraper:
             logger.error(f"Error checking message filter: {e}")
             return False
 
-    async def _process_token_message(self, message: Message, subscription: ChannelSubscription):
-        """Process message for token contract addresses"""
+    async def _get_channel_admins(self, channel_id: int) -> Set[int]:
+        """Return admin user IDs for a channel, refreshed every 5 minutes"""
+        entry = self._admin_cache.get(channel_id)
+        if entry and entry[0] > time.time():
+            return entry[1]
+
+        entity = await self.client.get_entity(channel_id)
+        admins = {participant.id async for participant in
+                  self.client.iter_participants(entity, filter=ChannelParticipantsAdmins)}
+        self._admin_cache[channel_id] = (time.time() + 300, admins)
+        return admins
+
+    async def _process_token_message(self, contract_info: Tuple[str, str],
+                                     subscription: ChannelSubscription, user: Optional[User]):
+        """Place a buy for a detected contract on behalf of one subscription"""
         try:
-            # Extract text from message
-            text = message.text or ""
-            if not text:
-                return
-
-            with PerformanceTimer("contract_detection"):
-                contract_info = detect_contract_address(text)
-
-            if not contract_info:
-                return  # No contract found
-
             chain, address = contract_info
 
-            # Get user settings
-            user = storage.get_user(subscription.user_id)
+            # User comes from the per-message bulk fetch
             if not user or not user.wallet_id:
                 logger.warning(f"User {subscription.user_id} not configured for trading")
                 return
@@ -342,16 +404,18 @@ class MTProtoScraper:
             # Log trade attempt
             logger.info(f"🎯 TOKEN DETECTED: {address} on {chain.upper()} from channel {subscription.channel_title}")
 
-            # Create order record
-            order = storage.create_order(
+            # Queue order record; the write worker persists it off the trade path
+            order = TradeOrder(
                 order_id=order_id,
                 user_id=subscription.user_id,
                 chain=chain,
                 pair=address,
                 order_type='buy',
                 amount=amount,
-                settings=user.settings.copy()
+                # user comes fresh from storage; a read-only view avoids copying it per trade
+                settings=MappingProxyType(user.settings)
             )
+            storage.queue_order(order)
 
             # Execute trade asynchronously for maximum speed
             asyncio.create_task(self._execute_ultra_fast_trade(
@@ -385,55 +449,85 @@ class MTProtoScraper:
 
             if response.get('err', True):
                 error_msg = response.get('message', 'Unknown error')
-                storage.update_order_status(order_id, 'failed', error_msg)
+                storage.queue_order_status(order_id, 'failed', error_msg)
 
                 logger.error(f"❌ TRADE FAILED: {order_id} | {error_msg} | {response_time:.0f}ms")
 
                 # Send failure notification
-                await self._send_notification(
+                self._notify_queue.put_nowait((
                     user_id,
-                    f"❌ **TRADE FAILED**\\n\\n"
-                    f"🆔 Order: `{order_id}`\\n"
-                    f"🔗 Contract: `{address[:8]}...{address[-4:]}`\\n"
-                    f"⚠️ Error: {error_msg}\\n"
+                    f"❌ **TRADE FAILED**\n\n"
+                    f"🆔 Order: `{order_id}`\n"
+                    f"🔗 Contract: `{address[:8]}...{address[-4:]}`\n"
+                    f"⚠️ Error: {error_msg}\n"
                     f"⏱️ Response: {response_time:.0f}ms"
-                )
+                ))
             else:
-                trade_id = response.get('res', {}).get('id', 'unknown')
-                storage.update_order_status(order_id, 'completed')
+                res = response.get('res')
+                trade_id = res.get('id', 'unknown') if isinstance(res, dict) else 'unknown'
+                storage.queue_order_status(order_id, 'completed', None)
 
                 # Update subscription stats
-                subscription.total_trades += 1
-                subscription.last_message_at = time.time()
+                storage.bump_channel(subscription.channel_id, subscription.user_id)
 
                 logger.info(f"✅ TRADE SUCCESS: {order_id} | {response_time:.0f}ms | TX: {trade_id}")
 
                 # Send success notification
-                await self._send_notification(
+                self._notify_queue.put_nowait((
                     user_id,
-                    f"✅ **BOUGHT {address[:8]}...{address[-4:]} in {response_time:.0f}ms**\\n\\n"
-                    f"🌐 Chain: {chain.upper()}\\n"
-                    f"💰 Amount: {amount}\\n"
-                    f"📡 From: {subscription.channel_title}\\n"
-                    f"🆔 Order: `{order_id}`\\n"
+                    f"✅ **BOUGHT {address[:8]}...{address[-4:]} in {response_time:.0f}ms**\n\n"
+                    f"🌐 Chain: {chain.upper()}\n"
+                    f"💰 Amount: {amount}\n"
+                    f"📡 From: {subscription.channel_title}\n"
+                    f"🆔 Order: `{order_id}`\n"
                     f"🔗 Trade: `{trade_id}`"
-                )
+                ))
 
         except Exception as e:
             error_msg = str(e)
             response_time = (time.time() - start_time) * 1000
-            storage.update_order_status(order_id, 'failed', error_msg)
+            storage.queue_order_status(order_id, 'failed', error_msg)
 
             logger.error(f"❌ TRADE ERROR: {order_id} | {error_msg} | {response_time:.0f}ms")
 
             # Send error notification
-            await self._send_notification(
+            self._notify_queue.put_nowait((
                 user_id,
-                f"❌ **TRADE ERROR**\\n\\n"
-                f"🆔 Order: `{order_id}`\\n"
-                f"⚠️ Error: {error_msg}\\n"
+                f"❌ **TRADE ERROR**\n\n"
+                f"🆔 Order: `{order_id}`\n"
+                f"⚠️ Error: {error_msg}\n"
                 f"⏱️ Time: {response_time:.0f}ms"
-            )
+            ))
+
+    async def _notify_worker(self, window: float = 0.1):
+        """Send queued notifications, merging those for one user within a short window"""
+        while True:
+            pending: Dict[int, List[str]] = {}
+            user_id, message = await self._notify_queue.get()
+            pending[user_id] = [message]
+
+            # Collect whatever else arrives within the window
+            await asyncio.sleep(window)
+            while not self._notify_queue.empty():
+                user_id, message = self._notify_queue.get_nowait()
+                pending.setdefault(user_id, []).append(message)
+
+            for user_id, messages in pending.items():
+                # Stay under Telegram's 4096-character message limit
+                batch = messages[0]
+                for message in messages[1:]:
+                    if len(batch) + len(message) + 2 > 4096:
+                        self._spawn_send(user_id, batch)
+                        batch = message
+                    else:
+                        batch = f"{batch}\n\n{message}"
+                self._spawn_send(user_id, batch)
+
+    def _spawn_send(self, user_id: int, message: str):
+        """Send a notification in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(self._send_notification(user_id, message))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
 
     async def _send_notification(self, user_id: int, message: str):
         """Send notification to user via MTProto client"""
@@ -454,6 +548,13 @@ class MTProtoScraper:
             # Close DBOTX API connection
             await dbotx_client.close_session()
 
+            # Persist queued order writes and coalesced channel stats
+            await storage.a_flush_order_writes()
+            storage.flush_channel_metrics()
+
+            if self._notify_task:
+                self._notify_task.cancel()
+
             # Disconnect Telethon client
             if self.client:
                 await self.client.disconnect()
@@ -466,19 +567,13 @@ class MTProtoScraper:
 # Global scraper instance
 scraper = MTProtoScraper()
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
-    logger.info(f"Received signal {signum}")
-    asyncio.create_task(scraper.stop())
-
 async def main():
     """Main entry point"""
     print("🔥 MTProto Ultra-Fast Scraper v1.0")
     print("=" * 50)
 
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Register signal handlers on the running loop so shutdown runs as a task
+    install_shutdown_handlers(scraper.stop)
 
     try:
         # Initialize and start scraper
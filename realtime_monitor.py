@@ -6,18 +6,20 @@ Battle-tested architecture for 0.004ms message filtering with 3 monitoring modes
 
 import asyncio
 import logging
-import signal
+import os
 import sys
 import time
+from types import MappingProxyType
 import random
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass
+from collections import deque
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 
 from telethon import TelegramClient, events
 from telethon.tl.types import (
-    Message, UpdateNewMessage, PeerChannel, PeerChat, PeerUser,
+    UpdateNewMessage, PeerChannel, PeerChat, PeerUser,
     ChannelParticipantsAdmins, MessageService
 )
 from telethon.tl.functions.channels import JoinChannelRequest
@@ -28,10 +30,10 @@ from telethon.errors import (
 )
 
 # Import existing components
-from config import API_ID, API_HASH, config, SPEED_MODE, HUMAN_DELAY_MIN, HUMAN_DELAY_MAX
-from models import storage, ChannelSubscription, FilterMode, ChannelType
+from config import API_ID, API_HASH, config, SPEED_MODE, HUMAN_DELAY_MIN, HUMAN_DELAY_MAX, CPU_AFFINITY
+from models import storage, ChannelSubscription, FilterMode, ChannelType, TradeOrder, User
 from api_client import client as dbotx_client
-from utils import detect_contract_address, generate_order_id, PerformanceTimer
+from utils import detect_contract_address, generate_order_id, install_shutdown_handlers, PerformanceTimer
 from token_validator import validator
 
 # Configure logging
@@ -60,42 +62,82 @@ class MonitorConfig:
     id: int                                 # Channel ID
     name: str                              # Channel name/username
     mode: MonitoringMode                   # Monitoring mode
-    user_ids: List[int] = None            # For USERS mode
+    user_ids: FrozenSet[int] = field(default_factory=frozenset)  # For USERS mode
     invite_hash: Optional[str] = None      # For private groups
+    subscription: Optional[ChannelSubscription] = field(default=None, repr=False)  # Source subscription
+    # Sender filter (from_id -> bool) compiled from mode/user_ids by RealTimeMonitor._compile_predicate
+    predicate: Optional[Callable[[object], Awaitable[bool]]] = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
-        if self.user_ids is None:
-            self.user_ids = []
+        # Frozen once here so USERS checks are hashed lookups
+        self.user_ids = frozenset(self.user_ids)
 
 
 class AdminCache:
     """Thread-safe admin caching system with 1-hour TTL"""
     
-    def __init__(self):
-        self._cache: Dict[int, Dict[int, bool]] = {}
-        self._timestamps: Dict[int, float] = {}
-        self._lock = asyncio.Lock()
-        
-    async def get_admins(self, channel_id: int, client: TelegramClient) -> Set[int]:
+    def __init__(self, max_entries: int = 1000):
+        # channel_id -> (fetched_at, admin IDs), so a hit is a single dict lookup;
+        # kept in fetch order so the oldest entry is first when the cap is hit
+        self._cache: Dict[int, Tuple[float, FrozenSet[int]]] = {}
+        # One refresh lock per channel so a slow fetch never blocks other channels
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self.max_entries = max_entries
+    
+    def _get_fresh(self, channel_id: int, now: float) -> Optional[FrozenSet[int]]:
+        """Return cached admins if still within the 1 hour TTL"""
+        entry = self._cache.get(channel_id)
+        if entry and now - entry[0] < 3600:
+            return entry[1]
+        return None
+        
+    async def get_admins(self, channel_id: int, client: TelegramClient) -> FrozenSet[int]:
         """Get admins for channel with caching"""
-        async with self._lock:
+        # Cache hits skip the lock entirely
+        admins = self._get_fresh(channel_id, time.time())
+        if admins is not None:
+            return admins
+        
+        lock = self._locks.get(channel_id)
+        if lock is None:
+            lock = self._locks[channel_id] = asyncio.Lock()
+        
+        async with lock:
             now = time.time()
             
-            # Check cache validity (1 hour TTL)
-            if (channel_id in self._cache and 
-                channel_id in self._timestamps and
-                now - self._timestamps[channel_id] < 3600):
-                return set(self._cache[channel_id].keys())
+            # Another task may have refreshed it while we waited
+            admins = self._get_fresh(channel_id, now)
+            if admins is not None:
+                return admins
             
             # Fetch fresh admin list
             try:
-                admins = await self._fetch_channel_admins(channel_id, client)
-                self._cache[channel_id] = {admin_id: True for admin_id in admins}
-                self._timestamps[channel_id] = now
+                admins = frozenset(await self._fetch_channel_admins(channel_id, client))
+                # Re-insert so refreshed entries move to the end of the fetch order
+                self._cache.pop(channel_id, None)
+                self._cache[channel_id] = (now, admins)
+                while len(self._cache) > self.max_entries:
+                    del self._cache[next(iter(self._cache))]
                 return admins
             except Exception as e:
                 logger.error(f"Failed to fetch admins for {channel_id}: {e}")
-                return set()
+                return frozenset()
+    
+    def purge(self, active_channel_ids: Set[int]):
+        """Drop expired entries and channels that are no longer monitored"""
+        now = time.time()
+        stale = [channel_id for channel_id, (fetched_at, _) in self._cache.items()
+                 if now - fetched_at >= 3600 or channel_id not in active_channel_ids]
+        for channel_id in stale:
+            del self._cache[channel_id]
+        
+        # Keep locks only for monitored channels, and never one that is held
+        for channel_id in [channel_id for channel_id, lock in self._locks.items()
+                           if channel_id not in active_channel_ids and not lock.locked()]:
+            del self._locks[channel_id]
+        
+        if stale:
+            logger.debug(f"🧹 Purged {len(stale)} admin cache entries")
     
     async def _fetch_channel_admins(self, channel_id: int, client: TelegramClient) -> Set[int]:
         """Fetch admin list using appropriate API for entity type"""
@@ -142,17 +184,49 @@ class RealTimeMonitor:
         self.client: Optional[TelegramClient] = None
         self.running = False
         self.monitor_configs: List[MonitorConfig] = []
+        # abs(channel ID) -> dispatcher returning the first config matching a sender,
+        # rebuilt whenever monitor_configs changes
+        self._channel_index: Dict[int, Callable[[object], Awaitable[Optional[MonitorConfig]]]] = {}
         self.admin_cache = AdminCache()
         
         # Performance tracking
         self.messages_processed = 0
-        self.filter_times = []
+        self.filter_times = deque(maxlen=4096)  # Ring buffer of recent filter times (ms)
+        # Running count/sum/max since the last report, so reporting never scans the buffer
+        self._filter_count = 0
+        self._filter_sum = 0.0
+        self._filter_max = 0.0
         self.start_time = time.time()
+        self.message_log_interval = 100  # Log 1 in N monitored messages
+        self.messages_dropped = 0
+        self._api_ns = deque(maxlen=4096)  # Ring buffer of recent fast_buy latencies (ns)
+        
+        # Bounded hand-off from the update handler to a fixed pool of workers
+        self._work_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.worker_count = 8
+        
+        # Human-like delays for ban prevention; SPEED_MODE is fixed at startup, so pick once
+        self._apply_human_delay = self._noop_delay if SPEED_MODE else self._random_delay
+        
+        # Background loops with independent cadences, started by start_monitoring
+        self.report_interval = 30  # Seconds between performance reports
+        self._perf_task: Optional[asyncio.Task] = None
+        self._config_task: Optional[asyncio.Task] = None
         
         # Hot reload tracking
-        self.last_config_check = time.time()
-        self.config_check_interval = 5  # Check every 5 seconds
-        self.last_channel_count = 0
+        self.config_check_interval = 5  # Check every 5 seconds while channels are changing
+        self.max_config_check_interval = 60  # Back off to this when nothing changes
+        # Tighter cap while users are cached, bounding how stale their settings get
+        self.max_cached_user_age = 10
+        self._stable_polls = 0
+        # Storage change stamp and subscription fingerprint seen at the last poll;
+        # _config_version is bumped each time the monitor configs are rebuilt
+        self._storage_version: Optional[tuple] = None
+        self._config_fingerprint: Optional[int] = None
+        self._config_version = 0
+        # Subscribed users by ID, refreshed off the message path by the config poll
+        self._user_cache: Dict[int, User] = {}
         
     async def initialize(self):
         """Initialize real-time monitoring client"""
@@ -185,8 +259,23 @@ class RealTimeMonitor:
         # Initialize DBOTX client
         await dbotx_client.start_session()
         
+        # Start message workers
+        self._work_queue = asyncio.Queue(maxsize=1000)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        
         logger.info("✅ Real-Time Monitor initialized successfully")
     
+    async def _worker(self):
+        """Handle queued relevant messages one at a time"""
+        while True:
+            text, config = await self._work_queue.get()
+            try:
+                await self._handle_relevant_message(text, config)
+            except Exception as e:
+                logger.error(f"❌ Worker failed handling message from {config.name}: {e}")
+            finally:
+                self._work_queue.task_done()
+    
     async def _authenticate(self):
         """Authenticate the client"""
         phone = config('SCRAPER_PHONE', default='')
@@ -209,11 +298,27 @@ class RealTimeMonitor:
         
         logger.info("✅ Authentication successful")
     
-    async def load_monitor_configs(self):
+    @staticmethod
+    def _fingerprint(active_channels: List[ChannelSubscription]) -> int:
+        """Cheap hash of the subscription fields monitor configs are built from"""
+        return hash(frozenset(
+            (sub.channel_id, sub.user_id, sub.channel_title, sub.channel_username,
+             sub.filter_mode, sub.allowed_user_ids, sub.custom_buy_amount)
+            for sub in active_channels
+        ))
+    
+    async def _refresh_user_cache(self, active_channels: List[ChannelSubscription]):
+        """Reload the subscribed users so message handling needs no storage reads"""
+        self._user_cache = await storage.a_get_users(list({sub.user_id for sub in active_channels}))
+    
+    async def load_monitor_configs(self, active_channels: Optional[List[ChannelSubscription]] = None):
         """Load monitoring configurations from storage"""
         try:
-            # Get all active channels from storage
-            active_channels = storage.get_all_active_channels()
+            # Get all active channels from storage (unless the caller already has them)
+            if active_channels is None:
+                self._storage_version = await storage.a_change_version()
+                active_channels = await storage.a_get_all_active_channels()
+                await self._refresh_user_cache(active_channels)
             
             self.monitor_configs.clear()
             for subscription in active_channels:
@@ -231,24 +336,87 @@ class RealTimeMonitor:
                     id=subscription.channel_id,
                     name=subscription.channel_username or subscription.channel_title,
                     mode=mode,
-                    user_ids=subscription.allowed_user_ids.copy()
+                    user_ids=subscription.allowed_user_ids,
+                    subscription=subscription
                 )
+                config.predicate = self._compile_predicate(config)
                 
                 self.monitor_configs.append(config)
             
+            self._rebuild_channel_index()
+            self._config_fingerprint = self._fingerprint(active_channels)
+            self._config_version += 1
             logger.info(f"📊 Loaded {len(self.monitor_configs)} monitor configurations")
             
         except Exception as e:
             logger.error(f"Failed to load monitor configs: {e}")
     
+    def _rebuild_channel_index(self):
+        """Index monitor configs by absolute channel ID for per-message lookups"""
+        channel_configs: Dict[int, List[MonitorConfig]] = {}
+        for config in self.monitor_configs:
+            channel_configs.setdefault(abs(config.id), []).append(config)
+        self._channel_index = {
+            channel_id: self._build_dispatch(configs)
+            for channel_id, configs in channel_configs.items()
+        }
+    
+    @staticmethod
+    def _build_dispatch(configs: List[MonitorConfig]) -> Callable[[object], Awaitable[Optional[MonitorConfig]]]:
+        """Fuse a channel's compiled predicates into one call returning the first match"""
+        if len(configs) == 1:
+            config = configs[0]
+            predicate = config.predicate
+            
+            async def dispatch(from_id) -> Optional[MonitorConfig]:
+                return config if await predicate(from_id) else None
+        else:
+            candidates = tuple((config.predicate, config) for config in configs)
+            
+            async def dispatch(from_id) -> Optional[MonitorConfig]:
+                for predicate, config in candidates:
+                    if await predicate(from_id):
+                        return config
+                return None
+        
+        return dispatch
+    
+    async def _resolve_entities(self, channel_ids: List[int]) -> Dict[int, object]:
+        """Resolve channel entities in one batched call, falling back to one at a time"""
+        channel_ids = list(dict.fromkeys(channel_ids))
+        if not channel_ids:
+            return {}
+        
+        try:
+            entities = await self.client.get_entity(channel_ids)
+            return dict(zip(channel_ids, entities))
+        except Exception as e:
+            # get_entity fails the whole batch if any ID is unresolvable
+            logger.debug(f"Batch entity resolution failed, resolving individually: {e}")
+        
+        resolved = {}
+        for channel_id in channel_ids:
+            try:
+                resolved[channel_id] = await self.client.get_entity(channel_id)
+            except Exception as e:
+                logger.debug(f"Could not resolve entity {channel_id}: {e}")
+        return resolved
+    
     async def join_entities(self):
         """Join all configured entities with validation"""
+        # Validate every channel in one batch; only unresolved ones need a join attempt
+        entities = await self._resolve_entities([config.id for config in self.monitor_configs])
+        
         valid_configs = []
         for config in self.monitor_configs:
+            if config.id in entities:
+                valid_configs.append(config)
+                continue
+            
             try:
-                # First validate the channel exists and is accessible
+                await self._join_single_entity(config)
+                
                 if await self._validate_channel_access(config):
-                    await self._join_single_entity(config)
                     valid_configs.append(config)
                     logger.info(f"✅ Successfully joined and validated: {config.name}")
                 else:
@@ -261,6 +429,7 @@ class RealTimeMonitor:
         
         # Update configs to only include valid channels
         self.monitor_configs = valid_configs
+        self._rebuild_channel_index()
         logger.info(f"📊 Final monitoring list: {len(self.monitor_configs)} valid channels")
     
     async def _validate_channel_access(self, config: MonitorConfig) -> bool:
@@ -329,37 +498,26 @@ class RealTimeMonitor:
             # Load configurations
             await self.load_monitor_configs()
             
-            # Initialize channel count tracker
-            self.last_channel_count = len(self.monitor_configs)
-            
             # Join all entities
             await self.join_entities()
             
-            # Register real-time update handler with channel-specific filtering
-            # This is more efficient than processing ALL Telegram messages
-            monitored_channel_entities = []
+            # Register ONE chat-agnostic handler; _process_update filters through
+            # self._channel_index, so config reloads only swap that dict
             for config in self.monitor_configs:
-                try:
-                    entity = await self.client.get_entity(config.id)
-                    monitored_channel_entities.append(entity)
-                    logger.info(f"🎯 Registered message handler for: {config.name} (ID: {config.id})")
-                except Exception as e:
-                    logger.warning(f"Could not get entity for {config.name}: {e}")
+                logger.info(f"🎯 Monitoring: {config.name} (ID: {config.id})")
             
-            # Register handler only for monitored channels
-            @self.client.on(events.NewMessage(chats=monitored_channel_entities))
+            @self.client.on(events.NewMessage())
             async def message_handler(event):
                 await self._process_update(event)
             
-            # Store handler reference
-            self._message_handler = message_handler
-            
-            # Start performance monitoring (includes config checking)
-            asyncio.create_task(self._performance_monitor())
+            # Start performance reporting and config hot reload as independent tasks
+            self._perf_task = asyncio.create_task(self._performance_monitor())
+            self._config_task = asyncio.create_task(self._config_watch_loop())
             
             logger.info("🎯 Real-Time Monitor active!")
             logger.info(f"📊 Monitoring {len(self.monitor_configs)} channels")
-            logger.info(f"🔄 Hot reload enabled - checking every {self.config_check_interval}s")
+            logger.info(f"🔄 Hot reload enabled - checking every {self.config_check_interval}-"
+                        f"{self.max_config_check_interval}s")
             
             # Keep running
             await self.client.run_until_disconnected()
@@ -369,218 +527,172 @@ class RealTimeMonitor:
             self.running = False
             raise
     
-    async def _process_update(self, event):
+    async def _process_update(self, event, perf_counter=time.perf_counter,
+                              PeerChannel=PeerChannel, PeerUser=PeerUser, MessageService=MessageService):
         """Process incoming update with pre-filtering to avoid unnecessary processing"""
-        start_time = time.perf_counter()
+        # Hot path: globals are bound as default args (fast locals) above
+        start_time = perf_counter()
         
         try:
             message = event.message
             
             # CRITICAL OPTIMIZATION: Pre-filter by channel IMMEDIATELY
-            channel_id = getattr(message.peer_id, 'channel_id', None) if hasattr(message, 'peer_id') else None
-            if not channel_id:
+            peer = message.peer_id
+            if type(peer) is not PeerChannel:
                 return  # Not a channel message, skip silently
+            channel_id = peer.channel_id
             
             # Check if we're monitoring this channel - BLOCK 99.9% of messages here
-            monitored_channel_ids = [abs(config.id) for config in self.monitor_configs]
-            if abs(channel_id) not in monitored_channel_ids:
+            dispatch = self._channel_index.get(abs(channel_id))
+            if dispatch is None:
                 # Silent return - no logging for non-monitored channels to reduce noise
                 return
             
-            # Only log messages from monitored channels
-            user_id = getattr(message.from_id, 'user_id', None) if hasattr(message, 'from_id') else None
-            message_text = getattr(message, 'message', '')[:100] if hasattr(message, 'message') else 'No text'
-            
-            logger.info(f"📨 MONITORED MESSAGE: Channel {channel_id} | User {user_id} | Text: {message_text}...")
-            
-            # Apply filtering pipeline with detailed logging
-            message_processed = False
-            for config in self.monitor_configs:
-                logger.debug(f"🔍 Checking config {config.id} ({config.name}) mode={config.mode.value}")
+            # Read text and sender once; service messages have no .message/.media
+            text = None if type(message) is MessageService else message.message
+            from_id = message.from_id
+            
+            # Log a sample of monitored messages rather than every one
+            if self.messages_processed % self.message_log_interval == 0:
+                # %.100s truncates lazily, only if the record is actually emitted
+                logger.info("📨 MONITORED MESSAGE (1 in %d): Channel %d | User %s | Text: %.100s...",
+                            self.message_log_interval, channel_id,
+                            from_id.user_id if type(from_id) is PeerUser else None,
+                            text or "")
+            
+            # Every mode needs plain text without media; then apply the channel's
+            # fused sender filter (channel already matched via the index)
+            config = await dispatch(from_id) if text and message.media is None else None
+            if config is not None:
+                logger.info(f"✅ MESSAGE PASSED FILTER: Channel {config.name} | Mode: {config.mode.value}")
                 
-                if await self._should_process_message(message, config):
-                    logger.info(f"✅ MESSAGE PASSED FILTER: Channel {config.name} | Mode: {config.mode.value}")
-                    
-                    # Log message content for contract detection
-                    if hasattr(message, 'message') and message.message:
-                        logger.info(f"📝 MESSAGE CONTENT: {message.message}")
-                        
-                        # Test contract detection immediately
-                        from utils import detect_contract_address
-                        contract_info = detect_contract_address(message.message)
-                        if contract_info:
-                            chain, address = contract_info
-                            logger.info(f"🎯 CONTRACT DETECTED LIVE: {chain.upper()} | {address}")
-                        else:
-                            logger.info(f"⚪ No contract detected in message")
-                    
-                    # Human-like delay for ban prevention
-                    await self._apply_human_delay()
-                    
-                    # Process message in background
-                    asyncio.create_task(
-                        self._handle_relevant_message(message, config)
-                    )
-                    message_processed = True
-                    break
-                else:
-                    logger.debug(f"❌ Message failed filter for {config.name}")
-            
-            if not message_processed:
-                logger.debug(f"⚪ Message not processed by any config")
+                # Human-like delay for ban prevention
+                await self._apply_human_delay()
+                
+                # Hand off to the worker pool; drop rather than queue without bound
+                try:
+                    self._work_queue.put_nowait((text, config))
+                except asyncio.QueueFull:
+                    self.messages_dropped += 1
+                    logger.warning(f"⚠️ Work queue full - dropped message from {config.name} "
+                                   f"({self.messages_dropped} dropped total)")
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("⚪ Message from channel %d not processed by any config", channel_id)
             
             # Track performance
-            filter_time = (time.perf_counter() - start_time) * 1000  # Convert to ms
+            filter_time = (perf_counter() - start_time) * 1000  # Convert to ms
             self.filter_times.append(filter_time)
+            self._filter_count += 1
+            self._filter_sum += filter_time
+            if filter_time > self._filter_max:
+                self._filter_max = filter_time
             self.messages_processed += 1
             
         except Exception as e:
             logger.error(f"❌ Error processing update: {e}", exc_info=True)
     
-    async def _should_process_message(self, message: Message, config: MonitorConfig) -> bool:
-        """Message filtering with detailed logging"""
-        
-        # 1. Channel check - blocks 99.9% of messages
-        if not hasattr(message.peer_id, 'channel_id'):
-            logger.debug(f"❌ Filter step 1: No channel_id in peer_id")
-            return False
-        
-        message_channel_id = message.peer_id.channel_id
-        config_channel_id = abs(config.id)
-        
-        if abs(message_channel_id) != config_channel_id:
-            logger.debug(f"❌ Filter step 1: Channel mismatch - message:{abs(message_channel_id)} vs config:{config_channel_id}")
-            return False
-        
-        logger.debug(f"✅ Filter step 1: Channel match - {abs(message_channel_id)}")
-        
-        # 2. Skip service messages
-        if isinstance(message, MessageService):
-            logger.debug(f"❌ Filter step 2: Service message skipped")
-            return False
-        
-        logger.debug(f"✅ Filter step 2: Not a service message")
-        
-        # 3. Check for text content
-        if not hasattr(message, 'message') or not message.message:
-            logger.debug(f"❌ Filter step 3: No text content")
-            return False
-        
-        if hasattr(message, 'media') and message.media:
-            logger.debug(f"❌ Filter step 3: Has media, skipping")
-            return False
-        
-        logger.debug(f"✅ Filter step 3: Has text content - {len(message.message)} chars")
+    def _compile_predicate(self, config: MonitorConfig) -> Callable[[object], Awaitable[bool]]:
+        """Build the sender filter for a config once, at load time"""
+        # _process_update has already rejected service, empty and media messages, so a
+        # predicate only decides on the sender: a type check, then set lookup or admin I/O.
+        # PeerUser is bound as a closure variable so predicates avoid global lookups.
+        user_peer_type = PeerUser
         
-        # 4. Apply monitoring mode
         if config.mode == MonitoringMode.ALL:
-            logger.debug(f"✅ Filter step 4: ALL mode - accepting message")
-            return True
+            async def predicate(from_id) -> bool:
+                return True
         
         elif config.mode == MonitoringMode.ADMINS:
-            if not hasattr(message, 'from_id') or not message.from_id:
-                logger.debug(f"❌ Filter step 4: ADMINS mode - no from_id")
-                return False
+            channel_id = config.id
+            admin_cache = self.admin_cache
+            client = self.client
             
-            user_id = message.from_id.user_id if hasattr(message.from_id, 'user_id') else None
-            if not user_id:
-                logger.debug(f"❌ Filter step 4: ADMINS mode - no user_id")
-                return False
+            async def predicate(from_id) -> bool:
+                if type(from_id) is not user_peer_type:
+                    return False
+                return from_id.user_id in await admin_cache.get_admins(channel_id, client)
+        
+        elif config.mode == MonitoringMode.USERS and config.user_ids:
+            allowed = config.user_ids
             
-            admins = await self.admin_cache.get_admins(config.id, self.client)
-            is_admin = user_id in admins
-            logger.debug(f"{'✅' if is_admin else '❌'} Filter step 4: ADMINS mode - user {user_id} admin check: {is_admin}")
-            return is_admin
+            async def predicate(from_id) -> bool:
+                return type(from_id) is user_peer_type and from_id.user_id in allowed
         
-        elif config.mode == MonitoringMode.USERS:
-            if not hasattr(message, 'from_id') or not message.from_id:
-                logger.debug(f"❌ Filter step 4: USERS mode - no from_id")
-                return False
+        else:
+            if config.mode != MonitoringMode.USERS:
+                logger.warning(f"⚠️ Unknown monitoring mode {config.mode} for {config.name}; messages will be ignored")
             
-            user_id = message.from_id.user_id if hasattr(message.from_id, 'user_id') else None
-            if not user_id:
-                logger.debug(f"❌ Filter step 4: USERS mode - no user_id")
+            # USERS mode with nobody allowed can never match
+            async def predicate(from_id) -> bool:
                 return False
-            
-            is_allowed = user_id in config.user_ids
-            logger.debug(f"{'✅' if is_allowed else '❌'} Filter step 4: USERS mode - user {user_id} in allowed list: {is_allowed}")
-            return is_allowed
         
-        logger.debug(f"❌ Filter step 4: Unknown mode {config.mode}")
-        return False
+        return predicate
     
-    async def _check_and_reload_configs(self):
-        """Check for new channels and reload configurations if needed"""
-        try:
-            # Get current active channels count
-            active_channels = storage.get_all_active_channels()
-            new_channel_count = len(active_channels)
-            
-            # Check if channel count changed
-            if new_channel_count != self.last_channel_count:
-                logger.info(f"🔄 CHANNEL CHANGE DETECTED: {self.last_channel_count} → {new_channel_count}")
-                
-                # Reload configurations
-                old_config_count = len(self.monitor_configs)
-                await self.load_monitor_configs()
-                
-                # Join any new channels
-                await self.join_entities()
-                
-                # Re-register handlers with new channels
-                await self._update_message_handlers()
-                
-                self.last_channel_count = new_channel_count
-                logger.info(f"✅ CONFIG RELOAD COMPLETE: {old_config_count} → {len(self.monitor_configs)} channels")
-                
-        except Exception as e:
-            logger.error(f"Error checking/reloading configs: {e}")
+    async def _config_watch_loop(self):
+        """Poll for channel changes, backing off exponentially while nothing changes"""
+        while self.running:
+            max_interval = self.max_cached_user_age if self._user_cache else self.max_config_check_interval
+            interval = min(max_interval, self.config_check_interval * 2 ** self._stable_polls)
+            await asyncio.sleep(interval)
+            
+            if await self._check_and_reload_configs():
+                self._stable_polls = 0
+            elif interval < max_interval:
+                self._stable_polls += 1
     
-    async def _update_message_handlers(self):
-        """Update message handlers with current channel list"""
+    async def _check_and_reload_configs(self) -> bool:
+        """Check for channel changes and reload configurations if needed; returns True on reload"""
         try:
-            # Remove old handlers
-            self.client.remove_event_handler(self._message_handler)
+            # Nothing was committed since the last poll: skip the queries entirely
+            version = await storage.a_change_version()
+            if version == self._storage_version:
+                return False
+            self._storage_version = version
+            # Something was committed: poll at the base interval again
+            self._stable_polls = 0
             
-            # Get monitored channel entities
-            monitored_channel_entities = []
-            for config in self.monitor_configs:
-                try:
-                    entity = await self.client.get_entity(config.id)
-                    monitored_channel_entities.append(entity)
-                except Exception as e:
-                    logger.warning(f"Could not get entity for {config.name}: {e}")
+            active_channels = await storage.a_get_all_active_channels()
             
-            # Register new handler
-            @self.client.on(events.NewMessage(chats=monitored_channel_entities))
-            async def message_handler(event):
-                await self._process_update(event)
+            # User settings can change without touching subscriptions
+            await self._refresh_user_cache(active_channels)
+            
+            if self._fingerprint(active_channels) == self._config_fingerprint:
+                return False
+            
+            old_config_count = len(self.monitor_configs)
+            logger.info(f"🔄 CHANNEL CHANGE DETECTED: {old_config_count} → {len(active_channels)}")
             
-            # Store handler reference
-            self._message_handler = message_handler
+            # Reload configurations
+            await self.load_monitor_configs(active_channels)
             
-            logger.info(f"📡 Updated message handlers for {len(monitored_channel_entities)} channels")
+            # Join any new channels (rebuilds the channel index the handler reads)
+            await self.join_entities()
+            
+            # Forget admin lists for channels that are no longer monitored
+            self.admin_cache.purge({config.id for config in self.monitor_configs})
             
+            logger.info(f"✅ CONFIG RELOAD COMPLETE (v{self._config_version}): "
+                        f"{old_config_count} → {len(self.monitor_configs)} channels")
+            return True
+                
         except Exception as e:
-            logger.error(f"Error updating message handlers: {e}")
-    
-    async def _apply_human_delay(self):
-        """Apply human-like delays for ban prevention - uses SPEED_MODE config"""
-        # SPEED_MODE: Skip all delays for maximum speed (instant processing)
-        if SPEED_MODE:
-            return
+            logger.error(f"Error checking/reloading configs: {e}")
         
-        # Normal mode: Use configurable minimal delays (50-100ms default)
-        delay = random.uniform(HUMAN_DELAY_MIN, HUMAN_DELAY_MAX)
-        await asyncio.sleep(delay)
+        return False
+    
+    async def _noop_delay(self):
+        """SPEED_MODE: Skip all delays for maximum speed (instant processing)"""
     
-    async def _handle_relevant_message(self, message: Message, config: MonitorConfig):
-        """Handle relevant message for token detection and trading with detailed logging"""
+    async def _random_delay(self, uniform=random.uniform, sleep=asyncio.sleep,
+                            low=HUMAN_DELAY_MIN, high=HUMAN_DELAY_MAX):
+        """Normal mode: Use configurable minimal delays (50-100ms default)"""
+        await sleep(uniform(low, high))
+    
+    async def _handle_relevant_message(self, text: str, config: MonitorConfig):
+        """Handle relevant message text for token detection and trading with detailed logging"""
         try:
             logger.info(f"🔄 PROCESSING RELEVANT MESSAGE from {config.name}")
             
-            # Extract message text
-            text = message.message
             if not text:
                 logger.warning(f"❌ No text in message from {config.name}")
                 return
@@ -599,24 +711,20 @@ class RealTimeMonitor:
             chain, address = contract_info
             logger.info(f"🎯 CONTRACT FOUND: {chain.upper()} | {address}")
             
-            # Find subscription for this channel
-            logger.info(f"🔍 Looking for subscription for channel {config.id}")
-            all_subscriptions = storage.get_all_active_channels()
-            subscription = None
-            for sub in all_subscriptions:
-                if sub.channel_id == config.id:
-                    subscription = sub
-                    logger.info(f"✅ Found subscription: User {sub.user_id}, Channel {sub.channel_title}")
-                    break
-            
+            # Subscription this config was built from (attached at load time)
+            subscription = config.subscription
             if not subscription:
                 logger.error(f"❌ No subscription found for channel {config.id}")
-                logger.info(f"Available subscriptions: {[(s.channel_id, s.channel_title) for s in all_subscriptions]}")
                 return
             
-            # Get user settings
-            logger.info(f"🔍 Getting user settings for user {subscription.user_id}")
-            user = storage.get_user(subscription.user_id)
+            logger.info(f"✅ Found subscription: User {subscription.user_id}, Channel {subscription.channel_title}")
+            
+            # Get user settings (cached by the config poll; storage only on a miss)
+            user = self._user_cache.get(subscription.user_id)
+            if user is None:
+                user = await storage.a_get_user(subscription.user_id)
+                if user:
+                    self._user_cache[user.user_id] = user
             if not user:
                 logger.error(f"❌ User {subscription.user_id} not found in storage")
                 return
@@ -668,18 +776,20 @@ class RealTimeMonitor:
             logger.info(f"   User: {user.username} ({user.user_id})")
             logger.info(f"   Channel: {config.name}")
             
-            # Create order record
-            logger.info(f"💾 Creating order record...")
-            order = storage.create_order(
+            # Queue order record; the order writer persists it off the trade path
+            order = TradeOrder(
                 order_id=order_id,
                 user_id=subscription.user_id,
                 chain=chain,
                 pair=address,
                 order_type='buy',
                 amount=amount,
-                settings=user.settings.copy()
+                # user may be shared with _user_cache; a read-only view keeps the order
+                # from mutating it without copying the settings per trade
+                settings=MappingProxyType(user.settings)
             )
-            logger.info(f"✅ Order record created: {order_id}")
+            storage.queue_order(order)
+            logger.info(f"💾 Order record queued: {order_id}")
             
             # Execute trade
             logger.info(f"⚡ Starting trade execution...")
@@ -695,59 +805,55 @@ class RealTimeMonitor:
                            address: str, amount: float, user_settings: dict,
                            wallet_id: str, subscription: ChannelSubscription):
         """Execute trade via DBOTX API"""
-        start_time = time.time()
+        # Monotonic clock: wall time can jump under NTP and skew latency figures
+        start_ns = time.perf_counter_ns()
         
         try:
             logger.info(f"⚡ EXECUTING TRADE: {order_id} | {chain.upper()} | {address}")
             
             # Execute via DBOTX API
-            with PerformanceTimer("api_trade_execution"):
-                response = await dbotx_client.fast_buy(
-                    chain=chain,
-                    pair=address,
-                    wallet_id=wallet_id,
-                    amount=amount,
-                    user_settings=user_settings
-                )
+            response = await dbotx_client.fast_buy(
+                chain=chain,
+                pair=address,
+                wallet_id=wallet_id,
+                amount=amount,
+                user_settings=user_settings
+            )
             
-            response_time = (time.time() - start_time) * 1000
+            api_ns = time.perf_counter_ns() - start_ns
+            self._api_ns.append(api_ns)
+            response_time = api_ns / 1e6
             
             if response.get('err', True):
                 error_msg = response.get('message', 'Unknown error')
-                storage.update_order_status(order_id, 'failed', error_msg)
+                storage.queue_order_status(order_id, 'failed', error_msg)
                 logger.error(f"❌ TRADE FAILED: {order_id} | {error_msg} | {response_time:.0f}ms")
             else:
-                trade_id = response.get('res', {}).get('id', 'unknown')
-                storage.update_order_status(order_id, 'completed')
+                res = response.get('res')
+                trade_id = res.get('id', 'unknown') if isinstance(res, dict) else 'unknown'
+                storage.queue_order_status(order_id, 'completed', None)
                 
                 # Update stats
-                subscription.total_trades += 1
-                subscription.last_message_at = time.time()
+                storage.bump_channel(subscription.channel_id, subscription.user_id)
                 
                 logger.info(f"✅ TRADE SUCCESS: {order_id} | {response_time:.0f}ms | TX: {trade_id}")
                 
         except Exception as e:
             error_msg = str(e)
-            response_time = (time.time() - start_time) * 1000
-            storage.update_order_status(order_id, 'failed', error_msg)
+            response_time = (time.perf_counter_ns() - start_ns) / 1e6
+            storage.queue_order_status(order_id, 'failed', error_msg)
             logger.error(f"❌ TRADE ERROR: {order_id} | {error_msg} | {response_time:.0f}ms")
     
     async def _performance_monitor(self):
         """Monitor performance metrics and system status"""
         while self.running:
             try:
-                # Check for config changes more frequently
-                current_time = time.time()
-                if current_time - self.last_config_check >= self.config_check_interval:
-                    await self._check_and_reload_configs()
-                    self.last_config_check = current_time
-                
-                await asyncio.sleep(30)  # Report every 30 seconds
+                await asyncio.sleep(self.report_interval)
                 
                 # Performance metrics
-                if self.filter_times:
-                    avg_filter_time = sum(self.filter_times) / len(self.filter_times)
-                    max_filter_time = max(self.filter_times)
+                if self._filter_count:
+                    avg_filter_time = self._filter_sum / self._filter_count
+                    max_filter_time = self._filter_max
                     
                     uptime = time.time() - self.start_time
                     msg_per_sec = self.messages_processed / uptime if uptime > 0 else 0
@@ -757,8 +863,14 @@ class RealTimeMonitor:
                               f"{msg_per_sec:.1f} msg/sec | "
                               f"{self.messages_processed} total")
                     
-                    # Reset metrics
-                    self.filter_times = []
+                    if self._api_ns:
+                        logger.info(f"📊 TRADE API: {sum(self._api_ns) / len(self._api_ns) / 1e6:.0f}ms avg | "
+                                    f"{max(self._api_ns) / 1e6:.0f}ms max over last {len(self._api_ns)} trades")
+                    
+                    # Reset interval aggregates (filter_times is bounded and keeps rolling)
+                    self._filter_count = 0
+                    self._filter_sum = 0.0
+                    self._filter_max = 0.0
                 
                 # System status
                 logger.info(f"🔄 SYSTEM STATUS:")
@@ -785,9 +897,22 @@ class RealTimeMonitor:
         self.running = False
         
         try:
+            # Stop background loops
+            for task in (self._perf_task, self._config_task):
+                if task:
+                    task.cancel()
+            
             # Close DBOTX connection
             await dbotx_client.close_session()
             
+            # Persist queued order writes and coalesced channel stats
+            await storage.a_flush_order_writes()
+            storage.flush_channel_metrics()
+            
+            # Stop message workers
+            for worker in self._workers:
+                worker.cancel()
+            
             # Disconnect client
             if self.client:
                 await self.client.disconnect()
@@ -802,18 +927,10 @@ class RealTimeMonitor:
 monitor = RealTimeMonitor()
 
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
-    logger.info("Received shutdown signal")
-    asyncio.create_task(monitor.stop())
-    sys.exit(0)
-
-
 async def main():
     """Main entry point"""
-    # Setup signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Register signal handlers on the running loop so shutdown runs as a task
+    install_shutdown_handlers(monitor.stop)
     
     try:
         # Initialize and start monitoring
@@ -829,4 +946,20 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Configure uvloop for better async performance
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("✅ Using uvloop for enhanced performance")
+    except ImportError:
+        logger.warning("⚠️ uvloop not available, using standard asyncio")
+    
+    # Pin to dedicated cores to reduce scheduling jitter on the hot path
+    if CPU_AFFINITY and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, CPU_AFFINITY)
+            logger.info(f"📌 Pinned to CPU(s) {sorted(CPU_AFFINITY)}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not set CPU affinity {sorted(CPU_AFFINITY)}: {e}")
+    
     asyncio.run(main())
\ No newline at end of file
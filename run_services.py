@@ -5,7 +5,6 @@ Manages both the Telegram bot and MTProto scraper services
 """
 
 import asyncio
-import subprocess
 import sys
 import signal
 import logging
@@ -13,6 +12,9 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between restarts of a service that keeps exiting right away
+RESTART_BACKOFF = 5
+
 class ServiceManager:
     """Manages both bot and scraper services"""
     
@@ -20,6 +22,33 @@ class ServiceManager:
         self.bot_process = None
         self.scraper_process = None
         self.running = False
+        # Service name -> (process attribute, script, restart notice); each one is
+        # supervised independently so restarts never queue behind one another
+        self._services = {
+            "bot": ("bot_process", "bot.py", "⚠️ Telegram bot stopped, restarting..."),
+            "scraper": ("scraper_process", "mtproto_scraper.py", "⚠️ MTProto scraper stopped, restarting..."),
+        }
+        self._pipe_tasks = set()
+    
+    async def _spawn(self, name: str):
+        """Start a service script and drain its output"""
+        attr_name, script, _ = self._services[name]
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, script,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        # Keep reading both pipes so a chatty child never blocks on a full buffer
+        for stream in (process.stdout, process.stderr):
+            task = asyncio.create_task(self._pipe(name, stream))
+            self._pipe_tasks.add(task)
+            task.add_done_callback(self._pipe_tasks.discard)
+        setattr(self, attr_name, process)
+        return process
+    
+    async def _pipe(self, name: str, stream):
+        """Drain a child's output pipe"""
+        async for line in stream:
+            logger.debug(f"[{name}] {line.decode(errors='replace').rstrip()}")
     
     async def start_services(self):
         """Start both services"""
@@ -31,18 +60,14 @@ class ServiceManager:
         try:
             # Start Telegram Bot (for user interface)
             print("📱 Starting Telegram Bot interface...")
-            self.bot_process = subprocess.Popen([
-                sys.executable, "bot.py"
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            await self._spawn("bot")
             
             # Wait a moment for bot to initialize
             await asyncio.sleep(3)
             
             # Start MTProto Scraper (for ultra-fast monitoring)
             print("🔥 Starting MTProto Scraper...")
-            self.scraper_process = subprocess.Popen([
-                sys.executable, "mtproto_scraper.py"
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            await self._spawn("scraper")
             
             print("✅ Both services started successfully!")
             print("\n🎯 System Status:")
@@ -58,29 +83,45 @@ class ServiceManager:
             await self.stop_services()
     
     async def _monitor_services(self):
-        """Monitor both services and restart if needed"""
+        """Monitor all services concurrently and restart them as soon as they exit"""
+        await asyncio.gather(*(self._check_one(name) for name in self._services))
+    
+    async def _check_one(self, name: str):
+        """Wait for one service to exit and restart it while running"""
+        attr_name, _, restart_notice = self._services[name]
         while self.running:
             try:
-                # Check bot process
-                if self.bot_process and self.bot_process.poll() is not None:
-                    print("⚠️ Telegram bot stopped, restarting...")
-                    self.bot_process = subprocess.Popen([
-                        sys.executable, "bot.py"
-                    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                process = getattr(self, attr_name)
+                started_at = time.monotonic()
+                await process.wait()
+                if not self.running:
+                    break
                 
-                # Check scraper process
-                if self.scraper_process and self.scraper_process.poll() is not None:
-                    print("⚠️ MTProto scraper stopped, restarting...")
-                    self.scraper_process = subprocess.Popen([
-                        sys.executable, "mtproto_scraper.py"
-                    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                # Restart immediately, but don't spin on a service that crashes at startup
+                uptime = time.monotonic() - started_at
+                if uptime < RESTART_BACKOFF:
+                    await asyncio.sleep(RESTART_BACKOFF - uptime)
+                    if not self.running:
+                        break
                 
-                await asyncio.sleep(5)  # Check every 5 seconds
+                print(restart_notice)
+                await self._spawn(name)
                 
             except Exception as e:
-                logger.error(f"Error monitoring services: {e}")
+                logger.error(f"Error monitoring {name}: {e}")
                 await asyncio.sleep(10)
     
+    async def _terminate(self, process):
+        """Terminate a service, killing it if it does not exit in time"""
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+    
     async def stop_services(self):
         """Stop both services"""
         print("\n🔄 Stopping services...")
@@ -88,35 +129,33 @@ class ServiceManager:
         
         if self.scraper_process:
             print("🔥 Stopping MTProto scraper...")
-            self.scraper_process.terminate()
-            try:
-                self.scraper_process.wait(timeout=10)
-            except subprocess.TimeoutExpired:
-                self.scraper_process.kill()
+            await self._terminate(self.scraper_process)
         
         if self.bot_process:
             print("📱 Stopping Telegram bot...")
-            self.bot_process.terminate()
-            try:
-                self.bot_process.wait(timeout=10)
-            except subprocess.TimeoutExpired:
-                self.bot_process.kill()
+            await self._terminate(self.bot_process)
         
         print("✅ All services stopped")
 
 # Global service manager
 service_manager = ServiceManager()
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
+# Strong references to in-flight shutdown tasks
+_shutdown_tasks = set()
+
+def signal_handler(signum):
+    """Handle shutdown signals (called on the event loop)"""
     print(f"\n📝 Received signal {signum}")
-    asyncio.create_task(service_manager.stop_services())
+    task = asyncio.create_task(service_manager.stop_services())
+    _shutdown_tasks.add(task)
+    task.add_done_callback(_shutdown_tasks.discard)
 
 async def main():
     """Main entry point"""
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Register signal handlers on the running loop so shutdown runs as a task
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, signal_handler, sig)
     
     try:
         await service_manager.start_services()
@@ -128,6 +167,14 @@ async def main():
         await service_manager.stop_services()
 
 if __name__ == "__main__":
+    # Configure uvloop for better async performance
+    try:
+        import uvloop
+        uvloop.install()
+        print("✅ Using uvloop for enhanced performance")
+    except ImportError:
+        print("⚠️ uvloop not available, using standard asyncio")
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
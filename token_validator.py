@@ -3,13 +3,26 @@ Token Safety Validator
 Validates tokens against user-configured safety filters before executing trades
 """
 import logging
+from types import MappingProxyType
 from typing import Dict, Any, Tuple, Optional, List
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only fallback for a missing safetyInfo or chain settings block
+_EMPTY_INFO = MappingProxyType({})
 
-@dataclass
+# Volume ratio timeframes in check order: (timeframe, buy key, sell key, setting key)
+_VOLUME_RATIOS = (
+    ('1m', 'buyVolume1m', 'sellVolume1m', 'volume_ratio_1m'),
+    ('5m', 'buyVolume5m', 'sellVolume5m', 'volume_ratio_5m'),
+    ('1h', 'buyVolume1h', 'sellVolume1h', 'volume_ratio_1h'),
+    ('6h', 'buyVolume6h', 'sellVolume6h', 'volume_ratio_6h'),
+    ('24h', 'buyVolume24h', 'sellVolume24h', 'volume_ratio_24h'),
+)
+
+
+@dataclass(slots=True)
 class ValidationResult:
     """Result of token validation"""
     is_safe: bool
@@ -17,12 +30,91 @@ class ValidationResult:
     pair_data: Optional[Dict[str, Any]] = None
 
 
+def _fmt_money(value: Optional[float]) -> str:
+    """Format a dollar amount for debug logs; only call when DEBUG is enabled"""
+    return f"${value:,.2f}" if value else "None"
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledChecks:
+    """One chain's safety settings reduced to the checks that are actually enabled"""
+    market_cap_min: Optional[float]
+    market_cap_max: Optional[float]
+    holders_min: Optional[int]
+    snipers_max: Optional[int]
+    require_launch: bool
+    # (timeframe, buy key, sell key, threshold %, sell/buy ratio that triggers rejection)
+    active_ratios: Tuple[Tuple[str, str, str, float, float], ...]
+    check_freeze: bool
+    check_mint: bool
+    top10_max: Optional[float]
+    lp_burn_min: Optional[float]
+
+
+def _as_number(value: Any, cast=float) -> Optional[float]:
+    """Coerce a threshold setting once at compile time (None = check disabled)"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ Ignoring non-numeric safety threshold: {value!r}")
+        return None
+
+
+def _compile_checks(chain_settings: Dict[str, Any]) -> CompiledChecks:
+    """Compile one chain's settings into the checks that are actually enabled"""
+    active_ratios = []
+    for timeframe, buy_key, sell_key, setting_key in _VOLUME_RATIOS:
+        threshold = _as_number(chain_settings.get(setting_key))
+        if threshold is not None:
+            active_ratios.append((timeframe, buy_key, sell_key, threshold, 1 + threshold / 100))
+    
+    return CompiledChecks(
+        market_cap_min=_as_number(chain_settings.get('market_cap_min')),
+        market_cap_max=_as_number(chain_settings.get('market_cap_max')),
+        holders_min=_as_number(chain_settings.get('holders_min'), int),
+        snipers_max=_as_number(chain_settings.get('snipers_max'), int),
+        require_launch=bool(chain_settings.get('require_launch_migration', False)),
+        active_ratios=tuple(active_ratios),
+        check_freeze=bool(chain_settings.get('check_freeze_authority', False)),
+        check_mint=bool(chain_settings.get('check_mint_authority', False)),
+        top10_max=_as_number(chain_settings.get('top10_holder_max')),
+        lp_burn_min=_as_number(chain_settings.get('lp_burn_min')),
+    )
+
+
+# id(settings object) -> (settings object, compiled value). Storage decodes a new
+# settings dict on every read, so a loaded object is never edited in place and
+# identity is enough to key on; holding the object keeps its id from being reused.
+_IDENTITY_CACHE_SIZE = 1024
+_compiled_settings: Dict[int, Tuple[Any, CompiledChecks]] = {}
+_compiled_chains: Dict[int, Tuple[Any, frozenset]] = {}
+
+
+def _compile_by_identity(cache: Dict[int, Tuple[Any, Any]], obj: Any, compile_fn) -> Any:
+    """Return compile_fn(obj), compiling at most once per settings object"""
+    entry = cache.get(id(obj))
+    if entry is not None and entry[0] is obj:
+        return entry[1]
+    if len(cache) >= _IDENTITY_CACHE_SIZE:
+        cache.clear()
+    value = compile_fn(obj)
+    cache[id(obj)] = (obj, value)
+    return value
+
+
 class TokenValidator:
     """Validates tokens against comprehensive safety filters"""
 
     def __init__(self):
         pass
 
+    @staticmethod
+    def _compile_settings(chain_settings: Dict[str, Any]) -> CompiledChecks:
+        """Get the compiled checks for one chain's settings"""
+        return _compile_by_identity(_compiled_settings, chain_settings, _compile_checks)
+
     def validate_token(
         self,
         pair_info_response: Dict[str, Any],
@@ -50,57 +142,56 @@ class TokenValidator:
             )
 
         # Extract pair data
-        res = pair_info_response.get('res', [])
-        if not res or len(res) == 0:
+        res = pair_info_response.get('res')
+        if not res:
             return ValidationResult(
                 is_safe=False,
                 rejection_reason="No pair data returned from API"
             )
 
         pair_data = res[0]
+        # Step-by-step progress is DEBUG only; string formatting here is skipped
+        # entirely on the hot path unless debug logging is switched on
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         # Log pair data for debugging
-        logger.info(f"🔍🔍🔍 TOKEN VALIDATOR: Starting validation")
-        logger.info(f"   ├─ Token Name: {pair_data.get('name', 'Unknown')}")
-        logger.info(f"   ├─ Token Symbol: {pair_data.get('symbol', 'Unknown')}")
-        logger.info(f"   ├─ Chain: {detected_chain}")
-        logger.info(f"   ├─ Market Cap: ${pair_data.get('marketCap', 0):,.2f}")
-        logger.info(f"   ├─ Holders: {pair_data.get('holders', 0)}")
-        logger.info(f"   └─ Snipers: {pair_data.get('snipersCount', 0)}")
-        logger.debug(f"📋 Full pair data: {pair_data}")
+        if debug:
+            logger.debug("🔍 TOKEN VALIDATOR: %s (%s) on %s | MC %s | Holders %s | Snipers %s",
+                         pair_data.get('name', 'Unknown'), pair_data.get('symbol', 'Unknown'), detected_chain,
+                         _fmt_money(pair_data.get('marketCap', 0)), pair_data.get('holders', 0),
+                         pair_data.get('snipersCount', 0))
+            logger.debug("📋 Full pair data: %s", pair_data)
 
         # 1. CHAIN VALIDATION (check global enabled_chains)
-        logger.info(f"✅ VALIDATION STEP 1: Chain Enablement Check")
-        enabled_chains = safety_settings.get('enabled_chains', ['solana'])
-        logger.info(f"   ├─ Detected chain: {detected_chain}")
-        logger.info(f"   ├─ Enabled chains: {enabled_chains}")
+        enabled_chains = safety_settings.get('enabled_chains', ('solana',))
+        if debug:
+            logger.debug("   STEP 1 Chain: %s | Enabled chains: %s", detected_chain, enabled_chains)
         
-        if detected_chain not in enabled_chains:
-            logger.warning(f"   └─ ❌ REJECTED: Chain not enabled")
+        if detected_chain not in _compile_by_identity(_compiled_chains, enabled_chains, frozenset):
+            logger.warning("   ❌ REJECTED: Chain %s not enabled", detected_chain)
             return ValidationResult(
                 is_safe=False,
                 rejection_reason=f"Chain '{detected_chain}' not enabled. Enabled chains: {', '.join(enabled_chains)}",
                 pair_data=pair_data
             )
-        logger.info(f"   └─ ✅ PASSED: Chain is enabled")
 
         # Get chain-specific safety settings
-        chain_settings = safety_settings.get(detected_chain, {})
-        logger.info(f"🔒 Retrieved {detected_chain.upper()} chain-specific settings")
-        logger.debug(f"   Chain settings: {chain_settings}")
+        chain_settings = safety_settings.get(detected_chain, _EMPTY_INFO)
+        checks = self._compile_settings(chain_settings)
+        if debug:
+            logger.debug("   %s chain settings: %s", detected_chain.upper(), chain_settings)
 
         # 2. MARKET CAP VALIDATION (per-chain)
-        logger.info(f"✅ VALIDATION STEP 2: Market Cap Check")
         market_cap = pair_data.get('marketCap', 0)
-        market_cap_min = chain_settings.get('market_cap_min')
-        market_cap_max = chain_settings.get('market_cap_max')
+        market_cap_min = checks.market_cap_min
+        market_cap_max = checks.market_cap_max
         
-        logger.info(f"   ├─ Current market cap: ${market_cap:,.2f}")
-        logger.info(f"   ├─ Min required: ${market_cap_min:,.2f}" if market_cap_min else "   ├─ Min required: None")
-        logger.info(f"   └─ Max allowed: ${market_cap_max:,.2f}" if market_cap_max else "   └─ Max allowed: None")
+        if debug:
+            logger.debug("   STEP 2 Market cap: %s | Min: %s | Max: %s",
+                         _fmt_money(market_cap), _fmt_money(market_cap_min), _fmt_money(market_cap_max))
 
         if market_cap_min is not None and market_cap < market_cap_min:
-            logger.warning(f"   ❌ REJECTED: Market cap below minimum")
+            logger.warning("   ❌ REJECTED: Market cap below minimum")
             return ValidationResult(
                 is_safe=False,
                 rejection_reason=f"Market cap ${market_cap:,.2f} below minimum ${market_cap_min:,.2f}",
@@ -108,49 +199,42 @@ class TokenValidator:
             )
 
         if market_cap_max is not None and market_cap > market_cap_max:
-            logger.warning(f"   ❌ REJECTED: Market cap above maximum")
+            logger.warning("   ❌ REJECTED: Market cap above maximum")
             return ValidationResult(
                 is_safe=False,
                 rejection_reason=f"Market cap ${market_cap:,.2f} above maximum ${market_cap_max:,.2f}",
                 pair_data=pair_data
             )
-        
-        logger.info(f"   ✅ PASSED: Market cap within range")
+
 
         # 3. HOLDERS VALIDATION (per-chain)
-        logger.info(f"✅ VALIDATION STEP 3: Holders Check")
         holders = pair_data.get('holders', 0)
-        holders_min = chain_settings.get('holders_min')
+        holders_min = checks.holders_min
         
-        logger.info(f"   ├─ Current holders: {holders}")
-        logger.info(f"   └─ Min required: {holders_min}" if holders_min else "   └─ Min required: None")
+        if debug:
+            logger.debug("   STEP 3 Holders: %s | Min: %s", holders, holders_min)
 
         if holders_min is not None and holders < holders_min:
-            logger.warning(f"   ❌ REJECTED: Holders below minimum")
+            logger.warning("   ❌ REJECTED: Holders below minimum")
             return ValidationResult(
                 is_safe=False,
                 rejection_reason=f"Holders ({holders}) below {detected_chain.upper()} minimum ({holders_min})",
                 pair_data=pair_data
             )
-        
-        logger.info(f"   ✅ PASSED: Holders meet requirement")
 
         # 4. SNIPERS COUNT VALIDATION (per-chain)
-        snipers_count = pair_data.get('snipersCount', 0)
-        snipers_max = chain_settings.get('snipers_max')
-
-        if snipers_max is not None and snipers_count > snipers_max:
-            return ValidationResult(
-                is_safe=False,
-                rejection_reason=f"Snipers count ({snipers_count}) above {detected_chain.upper()} maximum ({snipers_max})",
-                pair_data=pair_data
-            )
+        snipers_max = checks.snipers_max
+        if snipers_max is not None:
+            snipers_count = pair_data.get('snipersCount', 0)
+            if snipers_count > snipers_max:
+                return ValidationResult(
+                    is_safe=False,
+                    rejection_reason=f"Snipers count ({snipers_count}) above {detected_chain.upper()} maximum ({snipers_max})",
+                    pair_data=pair_data
+                )
 
         # 5. LAUNCH MIGRATION VALIDATION (per-chain)
-        require_launch_migration = chain_settings.get('require_launch_migration', False)
-        is_launch_migration = pair_data.get('isLaunchMigration', False)
-
-        if require_launch_migration and not is_launch_migration:
+        if checks.require_launch and not pair_data.get('isLaunchMigration', False):
             return ValidationResult(
                 is_safe=False,
                 rejection_reason="Token not officially launched by platform (Pump, etc.)",
@@ -158,20 +242,9 @@ class TokenValidator:
             )
 
         # 6. VOLUME RATIO VALIDATION (per-chain)
-        # If sell volume is X% or more higher than buy volume, reject
-        volume_ratios = {
-            '1m': ('buyVolume1m', 'sellVolume1m', 'volume_ratio_1m'),
-            '5m': ('buyVolume5m', 'sellVolume5m', 'volume_ratio_5m'),
-            '1h': ('buyVolume1h', 'sellVolume1h', 'volume_ratio_1h'),
-            '6h': ('buyVolume6h', 'sellVolume6h', 'volume_ratio_6h'),
-            '24h': ('buyVolume24h', 'sellVolume24h', 'volume_ratio_24h')
-        }
-
-        for timeframe, (buy_key, sell_key, setting_key) in volume_ratios.items():
-            threshold = chain_settings.get(setting_key)
-            if threshold is None:
-                continue
-
+        # If sell volume is X% or more higher than buy volume, reject.
+        # Only timeframes with a configured threshold are in active_ratios.
+        for timeframe, buy_key, sell_key, threshold, max_ratio in checks.active_ratios:
             buy_volume = pair_data.get(buy_key, 0)
             sell_volume = pair_data.get(sell_key, 0)
 
@@ -192,8 +265,8 @@ class TokenValidator:
             # If sell is 60% or more higher than buy, that means sell_volume / buy_volume >= 1.6
             if buy_volume > 0:
                 sell_to_buy_ratio = sell_volume / buy_volume
-                # If ratio >= threshold (e.g., 1.6 for 60% threshold), reject
-                if sell_to_buy_ratio >= (1 + threshold / 100):
+                # If ratio >= max_ratio (e.g., 1.6 for 60% threshold), reject
+                if sell_to_buy_ratio >= max_ratio:
                     return ValidationResult(
                         is_safe=False,
                         rejection_reason=f"Sell volume {timeframe} is {((sell_to_buy_ratio - 1) * 100):.1f}% higher than buy volume (threshold: {threshold}%)",
@@ -201,15 +274,11 @@ class TokenValidator:
                     )
 
         # 7. SECURITY CHECKS (per-chain)
-        safety_info = pair_data.get('safetyInfo', {})
+        safety_info = pair_data.get('safetyInfo') or _EMPTY_INFO
 
         # Freeze Authority Check (per-chain)
-        check_freeze_authority = chain_settings.get('check_freeze_authority', False)
-        freeze_authority = safety_info.get('freezeAuthority', False)
-        can_frozen = safety_info.get('canFrozen', False)
-
-        if check_freeze_authority:
-            if freeze_authority or can_frozen:
+        if checks.check_freeze:
+            if safety_info.get('freezeAuthority', False) or safety_info.get('canFrozen', False):
                 return ValidationResult(
                     is_safe=False,
                     rejection_reason=f"{detected_chain.upper()} safety: Token has freeze authority enabled",
@@ -217,12 +286,8 @@ class TokenValidator:
                 )
 
         # Mint Authority Check (per-chain)
-        check_mint_authority = chain_settings.get('check_mint_authority', False)
-        mint_authority = safety_info.get('mintAuthority', False)
-        can_mint = safety_info.get('canMint', False)
-
-        if check_mint_authority:
-            if mint_authority or can_mint:
+        if checks.check_mint:
+            if safety_info.get('mintAuthority', False) or safety_info.get('canMint', False):
                 return ValidationResult(
                     is_safe=False,
                     rejection_reason=f"{detected_chain.upper()} safety: Token has mint authority enabled",
@@ -230,21 +295,20 @@ class TokenValidator:
                 )
 
         # Top 10 Holder Rate Check (per-chain)
-        top10_holder_max = chain_settings.get('top10_holder_max')
-        top10_holder_rate = safety_info.get('top10HolderRate', 0)
-
-        if top10_holder_max is not None and top10_holder_rate > top10_holder_max:
-            return ValidationResult(
-                is_safe=False,
-                rejection_reason=f"Top 10 holders own {top10_holder_rate * 100:.1f}% ({detected_chain.upper()} max: {top10_holder_max * 100:.1f}%)",
-                pair_data=pair_data
-            )
+        top10_holder_max = checks.top10_max
+        if top10_holder_max is not None:
+            top10_holder_rate = safety_info.get('top10HolderRate', 0)
+            if top10_holder_rate > top10_holder_max:
+                return ValidationResult(
+                    is_safe=False,
+                    rejection_reason=f"Top 10 holders own {top10_holder_rate * 100:.1f}% ({detected_chain.upper()} max: {top10_holder_max * 100:.1f}%)",
+                    pair_data=pair_data
+                )
 
         # LP Burn/Lock Percentage Check (per-chain)
-        lp_burn_min = chain_settings.get('lp_burn_min')
-        burned_or_locked_lp = safety_info.get('burnedOrLockedLpPercent')
-
+        lp_burn_min = checks.lp_burn_min
         if lp_burn_min is not None:
+            burned_or_locked_lp = safety_info.get('burnedOrLockedLpPercent')
             if burned_or_locked_lp is None:
                 return ValidationResult(
                     is_safe=False,
@@ -260,10 +324,8 @@ class TokenValidator:
                 )
 
         # All checks passed!
-        logger.info(f"✅✅✅ ALL VALIDATION CHECKS PASSED")
-        logger.info(f"   ├─ Token: {pair_data.get('name', 'Unknown')} ({pair_data.get('symbol', 'Unknown')})")
-        logger.info(f"   ├─ Chain: {detected_chain.upper()}")
-        logger.info(f"   └─ Token is SAFE to trade")
+        logger.info("✅ ALL VALIDATION CHECKS PASSED: %s (%s) on %s is SAFE to trade",
+                    pair_data.get('name', 'Unknown'), pair_data.get('symbol', 'Unknown'), detected_chain.upper())
         
         return ValidationResult(
             is_safe=True,
@@ -4,13 +4,25 @@ Speed-optimized contract detection and validation
 """
 import re
 import time
-from typing import Optional, Tuple, Dict, Any, List
-from config import CHAIN_PATTERNS, EVM_RPC_ENDPOINTS
+from typing import Optional, Tuple, Dict, Any, Iterable, Iterator, Callable, Awaitable
+import itertools
+from functools import lru_cache
+from collections import OrderedDict
+from types import MappingProxyType
+from config import CHAIN_PATTERNS, EVM_RPC_ENDPOINTS, SETTING_METADATA, OWNER_CHAT_ID
 import logging
-import uuid
+import os
 import requests
 import aiohttp
 import asyncio
+import signal
+# Prefer orjson for DexScreener response parsing; fall back to ujson
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import ujson
+    _json_loads = ujson.loads
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +31,9 @@ COMPILED_PATTERNS = {
     chain: re.compile(pattern) 
     for chain, pattern in CHAIN_PATTERNS.items()
 }
+# Bound once for _detect_and_validate_address, which runs per candidate
+TRON_FORMAT_PATTERN = COMPILED_PATTERNS['tron']
+EVM_FORMAT_PATTERN = COMPILED_PATTERNS['bsc']  # EVM pattern works for all EVM chains
 
 # Link pattern matchers for extracting addresses from URLs (ULTRA-AGGRESSIVE)
 # Enhanced patterns that capture both chain and address
@@ -48,6 +63,55 @@ LINK_PATTERNS = {
     'generic_url': re.compile(r'https?://[^\s]+/([A-Za-z0-9]{32,})', re.IGNORECASE),
 }
 
+# Literal every LINK_PATTERNS entry requires (lowercase). A cheap substring test
+# on the lowered text rules a pattern out before its regex scans the message
+LINK_HINTS = {
+    'photon_sol': 'photon-sol.tinyastro.io',
+    'photon_bnb': 'photon-bnb.tinyastro.io',
+    'photon_base': 'photon-base.tinyastro.io',
+    'photon_eth': 'photon.tinyastro.io',
+    'dexscreener': 'dexscreener.com/',
+    'dbotx': 'dbotx.com/token/',
+    'gmgn': 'gmgn.ai/',
+    'dextools': 'dextools.io/',
+    'birdeye': 'birdeye.so/token/',
+    'pump': 'pump.fun/',
+    'raydium': 'raydium.io/',
+    'jupiter': 'jup.ag/swap/',
+    'generic_url': 'http',
+}
+
+# Every extraction pass needs a run of 32+ characters with no word separator in it
+# (separators are the ones _extract_from_text splits on); texts without one can't
+# contain an address, which is the common case for channel chatter
+ADDRESS_RUN_PATTERN = re.compile(r'[^ \n\r\t/\\|:,;"\'()\[\]{}]{32,}')
+
+# Candidate patterns used by _find_address_candidates and _extract_from_text
+TRON_ADDRESS_PATTERN = re.compile(r'T[A-HJ-NP-Za-km-z1-9]{33}')
+EVM_ADDRESS_PATTERN = re.compile(r'0x[a-fA-F0-9]{40}')
+SOLANA_ADDRESS_PATTERN = re.compile(r'(?<![A-Za-z0-9])[1-9A-HJ-NP-Za-km-z]{32,44}(?![A-Za-z0-9])')
+URL_PATH_ADDRESS_PATTERN = re.compile(r'/([A-Za-z0-9]{32,})')
+ZERO_WIDTH_PATTERN = re.compile(r'[\u200b\u200c\u200d\ufeff]')
+MULTI_SPACE_PATTERN = re.compile(r' {2,}')
+NORMALIZE_NEEDED_PATTERN = re.compile(r'[\u200b\u200c\u200d\ufeff]|  ')
+
+# Whole-word chain keywords (and explorer names) for _detect_evm_chain; one group per chain
+CHAIN_KEYWORD_PATTERN = re.compile(
+    r'\b(?:(?P<bsc>bscscan|bsc|bnb)|(?P<ethereum>etherscan|ethereum|eth)|(?P<base>basescan|base)'
+    r'|(?P<arbitrum>arbiscan|arbitrum|arb)|(?P<solana>solana|sol)|(?P<tron>tron|trx))\b',
+    re.IGNORECASE
+)
+# When several chains are mentioned, the lowest rank wins
+CHAIN_KEYWORD_PRIORITY = {'bsc': 0, 'ethereum': 1, 'base': 2, 'arbitrum': 3, 'solana': 4, 'tron': 5}
+CHAIN_KEYWORD_LABELS = {
+    'bsc': 'BSC',
+    'ethereum': 'Ethereum',
+    'base': 'Base',
+    'arbitrum': 'Arbitrum',
+    'solana': 'Solana',
+    'tron': 'Tron'
+}
+
 # Chain mapping for aggregator subdomains/paths
 CHAIN_MAPPING = {
     'sol': 'solana',
@@ -73,27 +137,43 @@ def detect_contract_address(text: str) -> Optional[Tuple[str, str]]:
     3. Clean and validate each candidate
     4. Return first valid match
     """
-    logger.info(f"🔍🔍🔍 DETECT_CONTRACT_ADDRESS CALLED")
-    logger.info(f"🔍 Input text length: {len(text) if text else 0}")
-    logger.info(f"🔍 Input preview: {repr(text[:200]) if text else 'None'}")
-
     if not text:
         logger.warning("❌ Contract detection: Empty text")
         return None
 
+    # Fast reject before any other work (so chatter never churns the cache): one linear
+    # scan instead of the full link/text pipeline. Deliberately looser than the
+    # address patterns, since the cleaner can rebuild addresses split by emoji etc.
+    if not ADDRESS_RUN_PATTERN.search(text):
+        logger.debug("⚪ No contract found in text (no address-length token)")
+        return None
+
+    return _detect_contract_address_cached(text)
+
+
+# Keyed on the text itself: str caches its hash, so a repeat (forward, echo,
+# several handlers) costs one dict lookup instead of the full link/text pipeline
+@lru_cache(maxsize=4096)
+def _detect_contract_address_cached(text: str) -> Optional[Tuple[str, str]]:
+    """Run the detection pipeline for text that passed the fast reject"""
+    logger.info("🔍🔍🔍 DETECT_CONTRACT_ADDRESS CALLED")
+    logger.info("🔍 Input text length: %d", len(text))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔍 Input preview: %r", text[:200])
+
     # STRATEGY 1: Extract from links first (highest confidence)
     link_result = _extract_from_links(text)
     if link_result:
-        logger.info(f"✅ Contract found via LINK extraction")
+        logger.info("✅ Contract found via LINK extraction")
         return link_result
 
     # STRATEGY 2: Extract from raw text using aggressive patterns
     text_result = _extract_from_text(text)
     if text_result:
-        logger.info(f"✅ Contract found via TEXT extraction")
+        logger.info("✅ Contract found via TEXT extraction")
         return text_result
 
-    logger.debug(f"⚪ No contract found in text")
+    logger.debug("⚪ No contract found in text")
     return None
 
 
@@ -104,10 +184,13 @@ def _extract_from_links(text: str) -> Optional[Tuple[str, str]]:
     """
     logger.debug("🔗 Checking for DEX tool links...")
 
+    lowered = text.lower()
     for tool_name, pattern in LINK_PATTERNS.items():
+        if LINK_HINTS[tool_name] not in lowered:
+            continue
         matches = pattern.findall(text)
         if matches:
-            logger.info(f"🔗 Found {len(matches)} {tool_name} link(s)")
+            logger.info("🔗 Found %d %s link(s)", len(matches), tool_name)
 
             for match in matches:
                 # Handle different match formats
@@ -123,7 +206,7 @@ def _extract_from_links(text: str) -> Optional[Tuple[str, str]]:
                             # Direct chain detection from URL
                             _, validated_address = _detect_and_validate_address(cleaned, f"{tool_name}_link", text)
                             if validated_address:
-                                logger.info(f"🎯 VALID ADDRESS from {tool_name}: {chain.upper()} | {validated_address}")
+                                logger.info("🎯 VALID ADDRESS from %s: %s | %s", tool_name, chain.upper(), validated_address)
                                 return (chain, validated_address)
                 else:
                     # Single group capture (address only)
@@ -142,14 +225,14 @@ def _extract_from_links(text: str) -> Optional[Tuple[str, str]]:
                         # Fallback to auto-detection with context
                         chain, validated_address = _detect_and_validate_address(cleaned, f"{tool_name}_link", text)
                         if chain and validated_address:
-                            logger.info(f"🎯 VALID ADDRESS from {tool_name}: {chain.upper()} | {validated_address}")
+                            logger.info("🎯 VALID ADDRESS from %s: %s | %s", tool_name, chain.upper(), validated_address)
                             return (chain, validated_address)
                         continue
 
                     # Validate with known chain
                     _, validated_address = _detect_and_validate_address(cleaned, f"{tool_name}_link", text)
                     if validated_address:
-                        logger.info(f"🎯 VALID ADDRESS from {tool_name}: {chain.upper()} | {validated_address}")
+                        logger.info("🎯 VALID ADDRESS from %s: %s | %s", tool_name, chain.upper(), validated_address)
                         return (chain, validated_address)
 
     return None
@@ -161,43 +244,42 @@ def _extract_from_text(text: str) -> Optional[Tuple[str, str]]:
 
     Pass 1: Normalize text
     Pass 2: Extract from permissive patterns
-    Pass 3: Word boundary extraction
-    Pass 4: Extract from URLs/paths
-    Pass 5: Brute force - find ANY 32+ char sequence
+    Pass 3: Word boundary extraction (fallback)
+    Pass 4: Extract from URLs/paths (fallback)
+    Pass 5: Brute force - find ANY 32+ char sequence (fallback)
+
+    Fallback passes only run when no Pass 2 candidate validates.
     """
     logger.debug("📝 Extracting from raw text...")
 
     # Pass 1: Normalize text
     normalized = _normalize_text(text)
-    logger.debug(f"📝 Normalized text length: {len(normalized)}")
-
-    # Pass 2: Permissive pattern extraction
-    candidates = _find_address_candidates(normalized)
-    logger.debug(f"📝 Found {len(candidates)} address candidates from patterns")
-
-    # Pass 3: Word boundary extraction - split by common separators and check each word
-    separators = [' ', '\n', '\r', '\t', '/', '\\', '|', ':', ',', ';', '"', "'", '(', ')', '[', ']', '{', '}']
-    words = [normalized]
-    for sep in separators:
-        new_words = []
-        for word in words:
-            new_words.extend(word.split(sep))
-        words = new_words
-
-    for word in words:
-        if len(word) >= 32:
-            # Could be an address
-            candidates.append(('unknown', word))
+    logger.debug("📝 Normalized text length: %d", len(normalized))
 
+    # Pass 2: Permissive pattern extraction (streamed; stops at the first valid one)
+    seen_addresses = set()
+    result = _first_valid_candidate(_find_address_candidates(normalized), text, seen_addresses)
+    if result:
+        return result
+
+    # The brute-force passes below only matter when no strict candidate validated,
+    # so they are skipped entirely on the common path
+
+    # Pass 3: Word boundary extraction - every separator-free run of 32+ chars
+    # could be an address (ADDRESS_RUN_PATTERN's class is exactly the separator set)
     # Pass 4: Extract from URLs and file paths
-    url_addresses = re.findall(r'/([A-Za-z0-9]{32,})', text)
-    for addr in url_addresses:
-        candidates.append(('unknown', addr))
+    candidates = itertools.chain(
+        (('unknown', word) for word in ADDRESS_RUN_PATTERN.findall(normalized)),
+        (('unknown', addr) for addr in URL_PATH_ADDRESS_PATTERN.findall(text))
+    )
+    logger.debug("📝 Trying fallback candidates")
 
-    logger.debug(f"📝 Total candidates after all passes: {len(candidates)}")
+    return _first_valid_candidate(candidates, text, seen_addresses)
 
-    # Clean and validate ALL candidates
-    seen_addresses = set()
+
+def _first_valid_candidate(candidates: Iterable[Tuple[str, str]], text: str,
+                           seen_addresses: set) -> Optional[Tuple[str, str]]:
+    """Clean and validate candidates in order, returning the first valid (chain, address)"""
     for candidate_type, raw_address in candidates:
         cleaned = _clean_address_aggressive(raw_address)
 
@@ -209,10 +291,14 @@ def _extract_from_text(text: str) -> Optional[Tuple[str, str]]:
             continue
         seen_addresses.add(cleaned)
 
-        # Detect chain and validate (pass full text as context)
-        chain, validated_address = _detect_and_validate_address(cleaned, candidate_type, text)
+        # Detect chain and validate (pass full text as context). A strict-pattern
+        # candidate the cleaner left untouched already has a proven format
+        if candidate_type != 'unknown' and cleaned == raw_address:
+            chain, validated_address = _validate_known(candidate_type, cleaned, text)
+        else:
+            chain, validated_address = _detect_and_validate_address(cleaned, candidate_type, text)
         if chain and validated_address:
-            logger.info(f"🎯 VALID ADDRESS from text: {chain.upper()} | {validated_address}")
+            logger.info("🎯 VALID ADDRESS from text: %s | %s", chain.upper(), validated_address)
             return (chain, validated_address)
 
     return None
@@ -224,43 +310,47 @@ def _normalize_text(text: str) -> str:
     - Remove zero-width spaces
     - Preserve structure but normalize excessive whitespace
     """
+    # Most messages need neither fix; one scan decides
+    if not NORMALIZE_NEEDED_PATTERN.search(text):
+        return text
+
     # Remove zero-width chars
-    text = re.sub(r'[\u200b\u200c\u200d\ufeff]', '', text)
+    text = ZERO_WIDTH_PATTERN.sub('', text)
 
     # Don't collapse newlines (addresses might span lines)
-    # Just normalize multiple spaces on same line
-    lines = text.split('\n')
-    normalized_lines = [re.sub(r' {2,}', ' ', line) for line in lines]
-
-    return '\n'.join(normalized_lines)
+    # Just normalize multiple spaces (the pattern never crosses a newline)
+    return MULTI_SPACE_PATTERN.sub(' ', text)
 
 
-def _find_address_candidates(text: str) -> List[Tuple[str, str]]:
+def _find_address_candidates(text: str) -> Iterator[Tuple[str, str]]:
     """
     ULTRA-AGGRESSIVE address detection with multiple extraction passes
-    Returns list of (type, raw_address) tuples
+    Yields (type, raw_address) tuples; later patterns only run if the caller keeps going
     """
-    candidates = []
+    # Repeated addresses (CA pasted twice, link + text) only need validating once
+    seen = set()
 
     # PASS 1: Direct extraction with strict continuous patterns only
+    # (findall yields the matched strings directly, no match objects)
     # TRON: T + exactly 33 base58 chars (continuous)
-    tron_pattern = r'T[A-HJ-NP-Za-km-z1-9]{33}'
-    for match in re.finditer(tron_pattern, text):
-        candidates.append(('tron', match.group(0)))
-
     # EVM: 0x + exactly 40 hex chars (continuous)
-    evm_pattern = r'0x[a-fA-F0-9]{40}'
-    for match in re.finditer(evm_pattern, text):
-        candidates.append(('evm', match.group(0)))
+    # Solana: 32-44 base58 chars (continuous); base58 has no '0', so only T needs skipping
+    for kind, pattern in (('tron', TRON_ADDRESS_PATTERN),
+                          ('evm', EVM_ADDRESS_PATTERN),
+                          ('solana', SOLANA_ADDRESS_PATTERN)):
+        for raw in pattern.findall(text):
+            if raw in seen or (kind == 'solana' and raw[0] == 'T'):
+                continue
+            seen.add(raw)
+            yield (kind, raw)
 
-    # Solana: 32-44 base58 chars (continuous)
-    solana_pattern = r'(?<![A-Za-z0-9])[1-9A-HJ-NP-Za-km-z]{32,44}(?![A-Za-z0-9])'
-    for match in re.finditer(solana_pattern, text):
-        raw = match.group(0)
-        if not raw.startswith('0x') and not raw.startswith('T'):
-            candidates.append(('solana', raw))
 
-    return candidates
+# str.translate delete tables for _clean_address_aggressive (ASCII input only)
+_NON_ALNUM_ASCII = dict.fromkeys(i for i in range(128) if not (chr(i).isalnum() or chr(i) == 'x'))
+_NON_ADDRESS_ASCII = dict.fromkeys(
+    i for i in range(128)
+    if chr(i) not in '0123456789abcdefABCDEFxXTtGgHhJjKkLlMmNnPpQqRrSsUuVvWwYyZz'
+)
 
 
 def _clean_address_aggressive(raw: str) -> str:
@@ -271,11 +361,11 @@ def _clean_address_aggressive(raw: str) -> str:
     - Extract pure address from any context
     """
     # Step 1: Remove ALL Unicode emojis, symbols, and special chars
-    # Keep only alphanumeric and x (for 0x)
-    cleaned = ''
-    for char in raw:
-        if char.isalnum() or char == 'x':
-            cleaned += char
+    # Keep only alphanumeric and x (for 0x); translate covers the usual ASCII case in C
+    if raw.isascii():
+        cleaned = raw.translate(_NON_ALNUM_ASCII)
+    else:
+        cleaned = ''.join(char for char in raw if char.isalnum() or char == 'x')
 
     # Step 2: Handle 0x prefix restoration
     if raw.strip().startswith('0') and 'x' in cleaned[:10]:
@@ -300,12 +390,10 @@ def _clean_address_aggressive(raw: str) -> str:
 
     # Step 4: Remove any remaining non-address characters
     # Keep only: 0-9, a-f, A-F (for EVM), 1-9, A-Z, a-z (for Solana/TRON)
-    final = ''
-    for char in cleaned:
-        if char in '0123456789abcdefABCDEFxXTtGgHhJjKkLlMmNnPpQqRrSsUuVvWwYyZz':
-            final += char
-
-    return final.strip()
+    # (every kept character is ASCII, so non-ASCII can be dropped up front)
+    if not cleaned.isascii():
+        cleaned = cleaned.encode('ascii', 'ignore').decode('ascii')
+    return cleaned.translate(_NON_ADDRESS_ASCII)
 
 
 def _detect_and_validate_address(address: str, source: str = 'unknown', context: str = '') -> Tuple[Optional[str], Optional[str]]:
@@ -320,43 +408,64 @@ def _detect_and_validate_address(address: str, source: str = 'unknown', context:
     """
     # TRON: T + 33 chars
     if len(address) == 34 and address.startswith('T') and address[1:].isalnum():
-        if COMPILED_PATTERNS['tron'].match(address):
-            # Try context detection first
-            chain_from_context = _detect_evm_chain(context, address) if context else None
-            if chain_from_context == 'tron':
-                logger.info(f"   ✅ Tron chain confirmed via context")
-            
-            if _validate_address('tron', address):
-                return ('tron', address)
+        if TRON_FORMAT_PATTERN.match(address):
+            result = _validate_known('tron', address, context)
+            if result[0]:
+                return result
 
     # EVM: 0x + 40 hex chars (could be BSC, Ethereum, Base, or Arbitrum)
     if len(address) == 42 and address.startswith('0x'):
-        if COMPILED_PATTERNS['bsc'].match(address):  # EVM pattern works for all
-            # Try to detect specific EVM chain via context
-            chain = None
-            if context:
-                chain = _detect_evm_chain(context, address)
-            
-            # If no context match, default to ethereum
-            if not chain:
-                chain = 'ethereum'
-                logger.info(f"   ⚠️ No context keywords found, defaulting to Ethereum")
-            
-            if _validate_address(chain, address):
-                return (chain, address)
+        if EVM_FORMAT_PATTERN.match(address):
+            result = _validate_known('evm', address, context)
+            if result[0]:
+                return result
 
     # Solana: 32-44 base58 chars
     if 32 <= len(address) <= 44 and not address.startswith('0x') and not address.startswith('T'):
-        # Try context detection first
-        chain_from_context = _detect_evm_chain(context, address) if context else None
-        if chain_from_context == 'solana':
-            logger.info(f"   ✅ Solana chain confirmed via context")
-        
+        result = _validate_known('solana', address, context)
+        if result[0]:
+            return result
+
+    logger.debug("❌ Failed validation: %s (len=%d, source=%s)", address, len(address), source)
+    return (None, None)
+
+
+def _validate_known(kind: str, address: str, context: str = '') -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve the chain for an address whose format is already proven
+    kind is 'tron', 'evm' or 'solana'; returns (chain, validated_address) or (None, None)
+    """
+    if kind == 'tron':
+        # Context only feeds the log line below, so skip the scan when it is muted
+        if context and logger.isEnabledFor(logging.INFO) and _detect_evm_chain(context, address) == 'tron':
+            logger.info("   ✅ Tron chain confirmed via context")
+
+        if _validate_address('tron', address):
+            return ('tron', address)
+
+    elif kind == 'evm':
+        # Try to detect specific EVM chain via context
+        chain = None
+        if context:
+            chain = _detect_evm_chain(context, address)
+
+        # If no context match, default to ethereum
+        if not chain:
+            chain = 'ethereum'
+            logger.info("   ⚠️ No context keywords found, defaulting to Ethereum")
+
+        if _validate_address(chain, address):
+            return (chain, address)
+
+    elif kind == 'solana':
+        # Context only feeds the log line below, so skip the scan when it is muted
+        if context and logger.isEnabledFor(logging.INFO) and _detect_evm_chain(context, address) == 'solana':
+            logger.info("   ✅ Solana chain confirmed via context")
+
         # Skip base58 character validation - send address as-is to DBOT API
         if _validate_address('solana', address):
             return ('solana', address)
 
-    logger.debug(f"❌ Failed validation: {address} (len={len(address)}, source={source})")
     return (None, None)
 
 
@@ -367,56 +476,57 @@ def _detect_evm_chain(context: str, address: str) -> Optional[str]:
     
     Returns chain name or None if no keywords found
     """
-    context_lower = context.lower()
-    
-    logger.info(f"🔗 Chain detection: Analyzing context for keywords")
-    logger.debug(f"   Context preview: {context_lower[:200]}")
-    
-    # STRICT KEYWORD MATCHING - Each chain has specific keywords only
-    
-    # BSC - Only "bsc"
-    if 'bsc' in context_lower:
-        logger.info(f"🔗 Chain detection: Found BSC keyword")
-        return 'bsc'
-    
-    # Ethereum - Only "ethereum" or "eth"
-    if 'ethereum' in context_lower or 'eth' in context_lower:
-        logger.info(f"🔗 Chain detection: Found Ethereum keyword")
-        return 'ethereum'
-    
-    # Base - Only "base"
-    if 'base' in context_lower:
-        logger.info(f"🔗 Chain detection: Found Base keyword")
-        return 'base'
-    
-    # Arbitrum - Only "arb" or "arbitrum"
-    if 'arb' in context_lower or 'arbitrum' in context_lower:
-        logger.info(f"🔗 Chain detection: Found Arbitrum keyword")
-        return 'arbitrum'
+    # The answer depends on the context alone, so every candidate and link in a
+    # message shares one scan instead of rescanning the whole text per address
+    return _context_chain(context)
+
+
+@lru_cache(maxsize=256)
+def _context_chain(context: str) -> Optional[str]:
+    """Scan context for the highest-priority chain keyword (cached per text)"""
+    logger.info("🔗 Chain detection: Analyzing context for keywords")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("   Context preview: %s", context[:200].lower())
     
-    # Solana - Only "sol" or "solana"
-    if 'sol' in context_lower or 'solana' in context_lower:
-        logger.info(f"🔗 Chain detection: Found Solana keyword")
-        return 'solana'
+    # STRICT KEYWORD MATCHING - whole words only, so "method" is not ETH and an
+    # address containing "sol" is not Solana
+    chain = None
+    best_rank = len(CHAIN_KEYWORD_PRIORITY)
+    for match in CHAIN_KEYWORD_PATTERN.finditer(context):
+        rank = CHAIN_KEYWORD_PRIORITY[match.lastgroup]
+        if rank < best_rank:
+            chain, best_rank = match.lastgroup, rank
+            if rank == 0:
+                break  # Nothing can outrank BSC
     
-    # Tron - Only "trx" or "tron"
-    if 'trx' in context_lower or 'tron' in context_lower:
-        logger.info(f"🔗 Chain detection: Found Tron keyword")
-        return 'tron'
+    if chain:
+        logger.info("🔗 Chain detection: Found %s keyword", CHAIN_KEYWORD_LABELS[chain])
+        return chain
     
     # No keywords found
     logger.warning(f"🔗 Chain detection: No chain keywords found in context")
     return None
 
 
+# Placeholder addresses that are never a tradeable token
+_DEAD_SOLANA_ADDRESSES = frozenset({
+    '11111111111111111111111111111111',             # System Program
+    'So11111111111111111111111111111111111111112',  # Wrapped SOL
+})
+_DEAD_EVM_ADDRESSES = frozenset({
+    '0x0000000000000000000000000000000000000000',
+    '0xdead000000000000000000000000000000000000',
+})
+
+
 def _validate_address(chain: str, address: str) -> bool:
     """Additional validation for detected addresses"""
     if chain == 'solana':
         # Solana: Basic length check only (32-44 chars)
         if len(address) < 32 or len(address) > 44:
             return False
-        # Check for obvious scam patterns
-        if '1111111111111111111111111111111111111111111111' in address:
+        # Check for obvious scam patterns (the old 46-char '1' run could never fit)
+        if address in _DEAD_SOLANA_ADDRESSES:
             return False
 
     elif chain in ['bsc', 'base', 'ethereum']:
@@ -424,8 +534,7 @@ def _validate_address(chain: str, address: str) -> bool:
         if len(address) != 42 or not address.startswith('0x'):
             return False
         # Check for obvious scam patterns
-        if address.lower() in ['0x0000000000000000000000000000000000000000', 
-                              '0xdead000000000000000000000000000000000000']:
+        if address.lower() in _DEAD_EVM_ADDRESSES:
             return False
 
     elif chain == 'tron':
@@ -436,10 +545,43 @@ def _validate_address(chain: str, address: str) -> bool:
     return True
 
 
+# Shared DexScreener session: validation runs on every detected contract, so
+# reusing one pooled session skips a TCP/TLS handshake per lookup
+_dexscreener_session: Optional[aiohttp.ClientSession] = None
+DEXSCREENER_API_BASE = "https://api.dexscreener.com/latest/dex"
+
+# (chain, address) -> (expires_at, result) for recent successful validations, in LRU
+# order; alert spam repeats the same contract across channels within seconds
+DEXSCREENER_CACHE_TTL = 60.0
+DEXSCREENER_CACHE_SIZE = 4096
+_dexscreener_cache: OrderedDict = OrderedDict()
+_dexscreener_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+
+async def _get_dexscreener_session() -> aiohttp.ClientSession:
+    """Get (or lazily create) the shared DexScreener HTTP session"""
+    global _dexscreener_session
+    if _dexscreener_session is None or _dexscreener_session.closed:
+        _dexscreener_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60, ttl_dns_cache=300)
+        )
+    return _dexscreener_session
+
+
+async def close_dexscreener_session():
+    """Close the shared DexScreener HTTP session"""
+    global _dexscreener_session
+    if _dexscreener_session and not _dexscreener_session.closed:
+        await _dexscreener_session.close()
+    _dexscreener_session = None
+
+
 async def validate_via_dexscreener(chain: str, address: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Validate contract exists on DexScreener and extract verified token address
-    Uses FALLBACK STRATEGY: tries pairs endpoint first, then tokens endpoint
+    Queries the pairs and tokens endpoints concurrently; the first success wins.
+    Hits are cached for DEXSCREENER_CACHE_TTL seconds.
 
     Args:
         chain: Blockchain name (solana, ethereum, bsc, base, tron)
@@ -450,27 +592,56 @@ async def validate_via_dexscreener(chain: str, address: str) -> Tuple[bool, Opti
         - (True, None, token_address) if found on DexScreener
         - (False, "reason", None) if validation fails
     """
+    key = (chain, address)
+    now = time.monotonic()
+    entry = _dexscreener_cache.get(key)
+    if entry is not None and now < entry[0]:
+        _dexscreener_cache.move_to_end(key)
+        logger.info(f"♻️ DEXSCREENER VALIDATION (cached): {chain.upper()} | {address}")
+        return entry[1]
+
+    # Concurrent alerts for the same contract share one lookup
+    task = _dexscreener_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_validate_via_dexscreener(chain, address))
+        _dexscreener_inflight[key] = task
+        task.add_done_callback(lambda _: _dexscreener_inflight.pop(key, None))
+    # shield: a cancelled caller must not cancel the lookup others are awaiting
+    result = await asyncio.shield(task)
+
+    # Only hits are cached; a token DexScreener has not indexed yet may appear any moment
+    if result[0]:
+        _dexscreener_cache[key] = (time.monotonic() + DEXSCREENER_CACHE_TTL, result)
+        _dexscreener_cache.move_to_end(key)
+        if len(_dexscreener_cache) > DEXSCREENER_CACHE_SIZE:
+            _dexscreener_cache.popitem(last=False)
+    return result
+
+
+async def _validate_via_dexscreener(chain: str, address: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Query DexScreener, bypassing the validation cache"""
     logger.info(f"🔍 DEXSCREENER VALIDATION: {chain.upper()} | {address}")
     
-    # STRATEGY 1: Try pairs endpoint first (most common for aggregator links)
-    logger.info(f"   📍 STRATEGY 1: Trying /pairs endpoint...")
-    pairs_result = await _try_dexscreener_pairs(chain, address)
-    
-    if pairs_result[0]:  # Success
-        logger.info(f"   ✅ STRATEGY 1 SUCCESS: Found via /pairs endpoint")
-        return pairs_result
-    
-    logger.info(f"   ⚠️ STRATEGY 1 FAILED: {pairs_result[1]}")
-    
-    # STRATEGY 2: Fallback to tokens endpoint (for raw token addresses)
-    logger.info(f"   📍 STRATEGY 2: Trying /tokens endpoint (fallback)...")
-    tokens_result = await _try_dexscreener_tokens(chain, address)
-    
-    if tokens_result[0]:  # Success
-        logger.info(f"   ✅ STRATEGY 2 SUCCESS: Found via /tokens endpoint")
-        return tokens_result
-    
-    logger.info(f"   ⚠️ STRATEGY 2 FAILED: {tokens_result[1]}")
+    # Query both endpoints at once and take the first hit: a raw token address
+    # misses /pairs, so running them in sequence paid both round trips
+    logger.info(f"   📍 Trying /pairs and /tokens endpoints concurrently...")
+    labels = {
+        asyncio.create_task(_try_dexscreener_pairs(chain, address)): "/pairs",
+        asyncio.create_task(_try_dexscreener_tokens(chain, address)): "/tokens",
+    }
+    pending = set(labels)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result[0]:  # Success
+                    logger.info(f"   ✅ SUCCESS: Found via {labels[task]} endpoint")
+                    return result
+                logger.info(f"   ⚠️ {labels[task]} FAILED: {result[1]}")
+    finally:
+        for task in pending:
+            task.cancel()
     
     # Both strategies failed
     error_msg = f"Not found on DexScreener (tried pairs & tokens endpoints)"
@@ -481,33 +652,32 @@ async def validate_via_dexscreener(chain: str, address: str) -> Tuple[bool, Opti
 async def _try_dexscreener_pairs(chain: str, address: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """Try DexScreener /pairs endpoint"""
     try:
-        url = f"https://api.dexscreener.com/latest/dex/pairs/{chain}/{address}"
+        url = f"{DEXSCREENER_API_BASE}/pairs/{chain}/{address}"
         logger.debug(f"      └─ Pairs URL: {url}")
 
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return (False, f"HTTP {response.status}", None)
+        session = await _get_dexscreener_session()
+        async with session.get(url) as response:
+            if response.status != 200:
+                return (False, f"HTTP {response.status}", None)
 
-                data = await response.json()
-                pairs = data.get('pairs', [])
+            data = await response.json(loads=_json_loads)
+            pairs = data.get('pairs', [])
 
-                if not pairs or len(pairs) == 0:
-                    return (False, "No pairs found", None)
+            if not pairs or len(pairs) == 0:
+                return (False, "No pairs found", None)
 
-                # Extract token from first pair
-                pair_data = pairs[0]
-                base_token = pair_data.get('baseToken', {})
-                token_address = base_token.get('address', '')
-                
-                if not token_address:
-                    return (False, "No token address in pair data", None)
+            # Extract token from first pair
+            pair_data = pairs[0]
+            base_token = pair_data.get('baseToken', {})
+            token_address = base_token.get('address', '')
+            
+            if not token_address:
+                return (False, "No token address in pair data", None)
 
-                logger.debug(f"      ├─ Found token: {base_token.get('name', 'Unknown')} ({base_token.get('symbol', 'Unknown')})")
-                logger.debug(f"      └─ Token address: {token_address}")
-                
-                return (True, None, token_address)
+            logger.debug(f"      ├─ Found token: {base_token.get('name', 'Unknown')} ({base_token.get('symbol', 'Unknown')})")
+            logger.debug(f"      └─ Token address: {token_address}")
+            
+            return (True, None, token_address)
 
     except asyncio.TimeoutError:
         return (False, "Timeout", None)
@@ -518,39 +688,38 @@ async def _try_dexscreener_pairs(chain: str, address: str) -> Tuple[bool, Option
 async def _try_dexscreener_tokens(chain: str, address: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """Try DexScreener /tokens endpoint"""
     try:
-        url = f"https://api.dexscreener.com/latest/dex/tokens/{address}"
+        url = f"{DEXSCREENER_API_BASE}/tokens/{address}"
         logger.debug(f"      └─ Tokens URL: {url}")
 
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return (False, f"HTTP {response.status}", None)
-
-                data = await response.json()
-                pairs = data.get('pairs', [])
-
-                if not pairs or len(pairs) == 0:
-                    return (False, "No pairs found for token", None)
-
-                # Filter pairs by chain
-                chain_pairs = [p for p in pairs if p.get('chainId', '').lower() == chain.lower()]
-                
-                if not chain_pairs:
-                    return (False, f"No pairs on {chain}", None)
-
-                # Use first pair on this chain
-                pair_data = chain_pairs[0]
-                base_token = pair_data.get('baseToken', {})
-                token_address = base_token.get('address', '')
-                
-                if not token_address:
-                    return (False, "No token address in response", None)
-
-                logger.debug(f"      ├─ Found token: {base_token.get('name', 'Unknown')} ({base_token.get('symbol', 'Unknown')})")
-                logger.debug(f"      └─ Token address: {token_address}")
-                
-                return (True, None, token_address)
+        session = await _get_dexscreener_session()
+        async with session.get(url) as response:
+            if response.status != 200:
+                return (False, f"HTTP {response.status}", None)
+
+            data = await response.json(loads=_json_loads)
+            pairs = data.get('pairs', [])
+
+            if not pairs or len(pairs) == 0:
+                return (False, "No pairs found for token", None)
+
+            # Filter pairs by chain
+            chain_pairs = [p for p in pairs if p.get('chainId', '').lower() == chain.lower()]
+            
+            if not chain_pairs:
+                return (False, f"No pairs on {chain}", None)
+
+            # Use first pair on this chain
+            pair_data = chain_pairs[0]
+            base_token = pair_data.get('baseToken', {})
+            token_address = base_token.get('address', '')
+            
+            if not token_address:
+                return (False, "No token address in response", None)
+
+            logger.debug(f"      ├─ Found token: {base_token.get('name', 'Unknown')} ({base_token.get('symbol', 'Unknown')})")
+            logger.debug(f"      └─ Token address: {token_address}")
+            
+            return (True, None, token_address)
 
     except asyncio.TimeoutError:
         return (False, "Timeout", None)
@@ -558,6 +727,36 @@ async def _try_dexscreener_tokens(chain: str, address: str) -> Tuple[bool, Optio
         return (False, f"Error: {str(e)}", None)
 
 
+# Setting groups for validate_settings_input and format_setting_display
+_GROUP_SETTINGS = frozenset({'stopEarnGroup', 'stopLossGroup'})
+_BOOLEAN_SETTINGS = frozenset({
+    'jitoEnabled', 'customFeeAndTip', 'pnlOrderExpireExecute',
+    'pnlOrderUseMidPrice', 'pnlCustomConfigEnabled',
+    'check_freeze_authority', 'check_mint_authority', 'require_launch_migration'
+})
+_PERCENTAGE_SETTINGS = frozenset({
+    'maxSlippage', 'stopEarnPercent', 'stopLossPercent',
+    'migrateSellPercent', 'minDevSellPercent', 'devSellPercent',
+    'sell_maxSlippage', 'sell_amountOrPercent',
+    'top10_holder_max', 'lp_burn_min'
+})
+_COUNT_SETTINGS = frozenset({'market_cap_min', 'market_cap_max', 'holders_min', 'snipers_max'})
+_AMOUNT_SETTINGS = frozenset({'amountOrPercent', 'jitoTip', 'sell_jitoTip'})
+# Integer setting -> inclusive (min, max) bounds; None means unbounded
+_INT_SETTING_RANGES = {
+    'retries': (0, 10),
+    'concurrentNodes': (1, 3),
+    'gasFeeDelta': (0, None),
+    'sell_gasFeeDelta': (0, None),
+    'maxFeePerGas': (1, None),
+    'sell_maxFeePerGas': (1, None),
+    'pnlOrderExpireDelta': (1, 432000000)
+}
+_PRIORITY_FEE_SETTINGS = frozenset({'priorityFee', 'sell_priorityFee'})
+_TRUE_WORDS = frozenset({'true', '1', 'yes', 'on', 'enabled'})
+_FALSE_WORDS = frozenset({'false', '0', 'no', 'off', 'disabled'})
+
+
 def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, str]:
     """
     Validate and convert user input for settings
@@ -569,7 +768,7 @@ def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, st
     """
     try:
         # COMPLEX SETTINGS - Multi-line group configurations
-        if setting_key in ['stopEarnGroup', 'stopLossGroup']:
+        if setting_key in _GROUP_SETTINGS:
             # Parse multi-line format: "profit_percent: X, sell_percent: Y"
             lines = [line.strip() for line in value.strip().split('\n') if line.strip()]
 
@@ -639,25 +838,16 @@ def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, st
                 return False, None, f"Invalid format: {str(e)}"
 
         # Boolean settings
-        if setting_key in ['jitoEnabled', 'customFeeAndTip', 'pnlOrderExpireExecute', 
-                          'pnlOrderUseMidPrice', 'pnlCustomConfigEnabled',
-                          'check_freeze_authority', 'check_mint_authority', 'require_launch_migration']:
-            if value.lower() in ['true', '1', 'yes', 'on', 'enabled']:
+        if setting_key in _BOOLEAN_SETTINGS:
+            if value.lower() in _TRUE_WORDS:
                 return True, True, ""
-            elif value.lower() in ['false', '0', 'no', 'off', 'disabled']:
+            elif value.lower() in _FALSE_WORDS:
                 return True, False, ""
             else:
                 return False, None, "Please enter true/false, yes/no, or 1/0"
 
         # PERCENTAGE SETTINGS - User enters 0-100, we convert to 0-1.0
-        percentage_settings = [
-            'maxSlippage', 'stopEarnPercent', 'stopLossPercent',
-            'migrateSellPercent', 'minDevSellPercent', 'devSellPercent',
-            'sell_maxSlippage', 'sell_amountOrPercent',
-            'top10_holder_max', 'lp_burn_min'
-        ]
-
-        if setting_key in percentage_settings:
+        if setting_key in _PERCENTAGE_SETTINGS:
             val = float(value)
 
             # Accept 0-100 range (user input)
@@ -679,7 +869,7 @@ def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, st
                 return False, None, "Value must be positive"
 
         # MARKET CAP AND HOLDER SETTINGS - Integer values
-        if setting_key in ['market_cap_min', 'market_cap_max', 'holders_min', 'snipers_max']:
+        if setting_key in _COUNT_SETTINGS:
             val = int(float(value))
             if val >= 0:
                 return True, val, ""
@@ -687,7 +877,7 @@ def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, st
                 return False, None, "Value must be positive"
 
         # Amount settings (SOL/ETH/BNB amounts - no conversion)
-        if setting_key in ['amountOrPercent', 'jitoTip', 'sell_jitoTip']:
+        if setting_key in _AMOUNT_SETTINGS:
             val = float(value)
             if val > 0:
                 return True, val, ""
@@ -695,25 +885,18 @@ def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, st
                 return False, None, "Value must be greater than 0"
 
         # Integer settings
-        if setting_key in ['retries', 'concurrentNodes', 'gasFeeDelta', 'maxFeePerGas', 
-                          'sell_gasFeeDelta', 'sell_maxFeePerGas', 'pnlOrderExpireDelta']:
+        int_range = _INT_SETTING_RANGES.get(setting_key)
+        if int_range:
             val = int(float(value))
 
-            if setting_key == 'retries' and 0 <= val <= 10:
-                return True, val, ""
-            elif setting_key == 'concurrentNodes' and 1 <= val <= 3:
-                return True, val, ""
-            elif setting_key in ['gasFeeDelta', 'sell_gasFeeDelta'] and val >= 0:
-                return True, val, ""
-            elif setting_key in ['maxFeePerGas', 'sell_maxFeePerGas'] and val > 0:
-                return True, val, ""
-            elif setting_key == 'pnlOrderExpireDelta' and 0 < val <= 432000000:
+            low, high = int_range
+            if low <= val and (high is None or val <= high):
                 return True, val, ""
             else:
                 return False, None, f"Invalid range for {setting_key}"
 
         # String settings (priority fees)
-        if setting_key in ['priorityFee', 'sell_priorityFee']:
+        if setting_key in _PRIORITY_FEE_SETTINGS:
             # Can be empty string for auto, or a number
             if value == '' or value.lower() == 'auto':
                 return True, '', ""
@@ -727,10 +910,10 @@ def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, st
                 return False, None, "Invalid priority fee format"
 
         # Custom fee toggles
-        if setting_key in ['sell_customFeeAndTip']:
-            if value.lower() in ['true', '1', 'yes', 'on', 'enabled']:
+        if setting_key == 'sell_customFeeAndTip':
+            if value.lower() in _TRUE_WORDS:
                 return True, True, ""
-            elif value.lower() in ['false', '0', 'no', 'off', 'disabled']:
+            elif value.lower() in _FALSE_WORDS:
                 return True, False, ""
             else:
                 return False, None, "Please enter true/false"
@@ -744,6 +927,47 @@ def validate_settings_input(setting_key: str, value: str) -> Tuple[bool, Any, st
         return False, None, f"Validation error: {str(e)}"
 
 
+def _format_percent(value: float) -> str:
+    # Percentages are stored as 0-1.0 (0.1 → 10%, 0.5 → 50%, 1.0 → 100%)
+    return f"{value * 100:.1f}%"
+
+
+def _format_ratio(value: float) -> str:
+    # Volume ratios are already in % format (no conversion)
+    return f"{value:.0f}% threshold"
+
+
+def _format_amount(value: float) -> str:
+    # SOL/ETH/BNB amounts
+    return f"{value:.4f}"
+
+
+# Grouped formatting is comparatively slow and panels repeat the same values;
+# equal int/float values format identically, so sharing cache entries is safe
+@lru_cache(maxsize=256)
+def _format_money(value: float) -> str:
+    return f"${value:,.0f}"
+
+
+@lru_cache(maxsize=256)
+def _number_formatters(key: str) -> Tuple[Callable[[Any], str], Callable[[Any], str]]:
+    """Resolve (float formatter, int formatter) for a setting key once per key"""
+    if key in _PERCENTAGE_SETTINGS:
+        float_fmt = _format_percent
+    elif 'volume_ratio' in key:
+        float_fmt = _format_ratio
+    elif key in _AMOUNT_SETTINGS:
+        float_fmt = _format_amount
+    elif 'market_cap' in key:
+        float_fmt = _format_money
+    else:
+        float_fmt = str
+
+    # Only market cap ints get formatting (holders, snipers print as-is)
+    int_fmt = _format_money if 'market_cap' in key else str
+    return float_fmt, int_fmt
+
+
 def format_setting_display(key: str, value: Any) -> str:
     """
     Format setting values for display in menus
@@ -755,53 +979,76 @@ def format_setting_display(key: str, value: Any) -> str:
     if value is None:
         return "Not set"
 
-    if isinstance(value, bool):
-        return "✅ Enabled" if value else "❌ Disabled"
-
-    if isinstance(value, list):
-        # For enabled_chains
-        if key == 'enabled_chains':
-            return ', '.join([c.upper() for c in value]) if value else "None"
-        return str(value)
-
-    if isinstance(value, float):
-        # Format percentages (0.1 → 10%, 0.5 → 50%, 1.0 → 100%)
-        if key in ['maxSlippage', 'stopEarnPercent', 'stopLossPercent', 
-                  'migrateSellPercent', 'minDevSellPercent', 'devSellPercent',
-                  'sell_maxSlippage', 'sell_amountOrPercent',
-                  'top10_holder_max', 'lp_burn_min']:
-            return f"{value * 100:.1f}%"
-        # Format volume ratios (already in % format, no conversion)
-        elif 'volume_ratio' in key:
-            return f"{value:.0f}% threshold"
-        # Format amounts (SOL/ETH/BNB amounts)
-        elif key in ['amountOrPercent', 'jitoTip', 'sell_jitoTip']:
-            return f"{value:.4f}"
-        # Format market cap
-        elif 'market_cap' in key:
-            return f"${value:,.0f}"
-        else:
-            return str(value)
+    # Exact-type dispatch; subclasses resolve through their bases (bool before int)
+    handler = _SETTING_DISPLAY_HANDLERS.get(type(value)) or _display_handler_for(type(value))
+    return handler(key, value)
+
 
-    if isinstance(value, int):
-        # Format market cap, holders, snipers
-        if 'market_cap' in key:
-            return f"${value:,.0f}"
-        return str(value)
+def _display_bool(key: str, value: bool) -> str:
+    return "✅ Enabled" if value else "❌ Disabled"
 
-    if isinstance(value, str) and value == '':
-        return "Auto"
 
+def _display_list(key: str, value: list) -> str:
+    # For enabled_chains
+    if key == 'enabled_chains':
+        return ', '.join(map(str.upper, value)) if value else "None"
     return str(value)
 
 
+def _display_float(key: str, value: float) -> str:
+    return _number_formatters(key)[0](value)
+
+
+def _display_int(key: str, value: int) -> str:
+    return _number_formatters(key)[1](value)
+
+
+def _display_str(key: str, value: str) -> str:
+    return "Auto" if value == '' else str(value)
+
+
+def _display_other(key: str, value: Any) -> str:
+    return str(value)
+
+
+_SETTING_DISPLAY_HANDLERS = {
+    bool: _display_bool,
+    list: _display_list,
+    float: _display_float,
+    int: _display_int,
+    str: _display_str
+}
+
+
+@lru_cache(maxsize=64)
+def _display_handler_for(value_type: type) -> Callable[[str, Any], str]:
+    """Find the display handler for a type via its MRO (e.g. IntEnum -> int)"""
+    for base in value_type.__mro__:
+        handler = _SETTING_DISPLAY_HANDLERS.get(base)
+        if handler:
+            return handler
+    return _display_other
+
+
+def shorten_address(address: str, head: int = 8, tail: int = 6) -> str:
+    """Shorten an address to head...tail for display (short values are returned as-is)"""
+    if len(address) <= head + tail:
+        return address
+    return f"{address[:head]}...{address[-tail:]}"
+
+
+# Order status -> emoji for format_order_summary
+_ORDER_STATUS_EMOJI = {
+    'pending': '⏳',
+    'completed': '✅',
+    'failed': '❌'
+}
+
+
 def format_order_summary(order) -> str:
     """Format order details for display"""
-    status_emoji = {
-        'pending': '⏳',
-        'completed': '✅',
-        'failed': '❌'
-    }.get(order.status, '❓')
+    status = order.status
+    status_emoji = _ORDER_STATUS_EMOJI.get(status, '❓')
 
     # Format creation time
     time_diff = time.time() - order.created_at
@@ -813,16 +1060,16 @@ def format_order_summary(order) -> str:
         time_str = f"{int(time_diff // 3600)}h ago"
 
     # Format pair address
-    pair_display = order.pair
-    if len(pair_display) > 12:
-        pair_display = f"{pair_display[:8]}...{pair_display[-4:]}"
+    pair_display = shorten_address(order.pair, 8, 4)
 
-    summary = f"{status_emoji} **{order.order_type.upper()}** on {order.chain.upper()}\n"
-    summary += f"🔗 Contract: `{pair_display}`\n"
-    summary += f"💰 Amount: {order.amount}\n"
-    summary += f"⏰ {time_str}\n"
+    summary = (
+        f"{status_emoji} **{order.order_type.upper()}** on {order.chain.upper()}\n"
+        f"🔗 Contract: `{pair_display}`\n"
+        f"💰 Amount: {order.amount}\n"
+        f"⏰ {time_str}\n"
+    )
 
-    if order.status == 'failed' and order.error_message:
+    if status == 'failed' and order.error_message:
         summary += f"❌ Error: {order.error_message}\n"
 
     return summary
@@ -830,93 +1077,126 @@ def format_order_summary(order) -> str:
 
 def generate_order_id() -> str:
     """Generate unique order ID"""
-    return f"ord_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+    # 8 random hex chars: the same entropy as uuid4().hex[:8] (its first 4 bytes are
+    # all random) without building a UUID object and a 32-char string
+    return f"ord_{int(time.time())}_{os.urandom(4).hex()}"
+
+
+# format_settings_summary layout: (section header, ((emoji, setting key, formatted), ...));
+# unformatted settings print their raw value
+_SETTINGS_SUMMARY_SECTIONS = (
+    ("**💰 BUY SETTINGS - Basic Trading**", (
+        ("💵", 'amountOrPercent', True),
+        ("📊", 'maxSlippage', True),
+        ("🔄", 'retries', False),
+        ("⚡", 'concurrentNodes', False),
+    )),
+    ("**⛽ Gas & Fees**", (
+        ("🛡️", 'jitoEnabled', True),
+        ("💸", 'jitoTip', True),
+        ("🔧", 'customFeeAndTip', True),
+        ("⚡", 'priorityFee', True),
+    )),
+    ("**📤 SELL SETTINGS**", (
+        ("🚀", 'migrateSellPercent', True),
+        ("👨‍💻", 'minDevSellPercent', True),
+        ("📊", 'devSellPercent', True),
+    )),
+)
 
 
 def format_settings_summary(user_settings: Dict[str, Any]) -> str:
     """Format user settings for display with user-friendly names"""
-    summary = "**🔧 Current Settings**\n\n"
-
-    # Buy Settings - Basic
-    summary += "**💰 BUY SETTINGS - Basic Trading**\n"
-    summary += f"💵 {get_setting_display_name('amountOrPercent')}: {format_setting_display('amountOrPercent', user_settings.get('amountOrPercent'))}\n"
-    summary += f"📊 {get_setting_display_name('maxSlippage')}: {format_setting_display('maxSlippage', user_settings.get('maxSlippage'))}\n"
-    summary += f"🔄 {get_setting_display_name('retries')}: {user_settings.get('retries', 'Not set')}\n"
-    summary += f"⚡ {get_setting_display_name('concurrentNodes')}: {user_settings.get('concurrentNodes', 'Not set')}\n\n"
-
-    # Buy Settings - Gas & Fees
-    summary += "**⛽ Gas & Fees**\n"
-    summary += f"🛡️ {get_setting_display_name('jitoEnabled')}: {format_setting_display('jitoEnabled', user_settings.get('jitoEnabled'))}\n"
-    summary += f"💸 {get_setting_display_name('jitoTip')}: {format_setting_display('jitoTip', user_settings.get('jitoTip'))}\n"
-    summary += f"🔧 {get_setting_display_name('customFeeAndTip')}: {format_setting_display('customFeeAndTip', user_settings.get('customFeeAndTip'))}\n"
-    summary += f"⚡ {get_setting_display_name('priorityFee')}: {format_setting_display('priorityFee', user_settings.get('priorityFee'))}\n\n"
-
-    # Sell Settings
-    summary += "**📤 SELL SETTINGS**\n"
-    summary += f"🚀 {get_setting_display_name('migrateSellPercent')}: {format_setting_display('migrateSellPercent', user_settings.get('migrateSellPercent'))}\n"
-    summary += f"👨‍💻 {get_setting_display_name('minDevSellPercent')}: {format_setting_display('minDevSellPercent', user_settings.get('minDevSellPercent'))}\n"
-    summary += f"📊 {get_setting_display_name('devSellPercent')}: {format_setting_display('devSellPercent', user_settings.get('devSellPercent'))}\n\n"
+    get = user_settings.get
+    display_name = get_setting_display_name
+    display_value = format_setting_display
+    parts = ["**🔧 Current Settings**\n\n"]
+    append = parts.append
+
+    for header, rows in _SETTINGS_SUMMARY_SECTIONS:
+        append(f"{header}\n")
+        for emoji, key, formatted in rows:
+            value = display_value(key, get(key)) if formatted else get(key, 'Not set')
+            append(f"{emoji} {display_name(key)}: {value}\n")
+        append("\n")
 
     # Safety Filters
-    summary += "**🔒 SAFETY FILTERS**\n"
-    enabled_chains = user_settings.get('enabled_chains', ['solana'])
-    summary += f"🌐 Active Chain: {', '.join([c.upper() for c in enabled_chains])}\n"
+    append("**🔒 SAFETY FILTERS**\n")
+    enabled_chains = get('enabled_chains', ['solana'])
+    append(f"🌐 Active Chain: {', '.join(map(str.upper, enabled_chains))}\n")
 
-    return summary
+    return "".join(parts)
 
 
 def is_owner(user_id: int) -> bool:
     """Check if user is the bot owner"""
-    from config import OWNER_CHAT_ID
     return user_id == OWNER_CHAT_ID
 
 
 def log_trade_attempt(user_id: int, chain: str, pair: str, amount: float):
     """Log trade attempt for monitoring"""
-    logger.info(f"TRADE_ATTEMPT: User {user_id} | {chain.upper()} | {pair} | Amount: {amount}")
+    logger.info("TRADE_ATTEMPT: User %s | %s | %s | Amount: %s", user_id, chain.upper(), pair, amount)
 
 
 def log_trade_result(order_id: str, success: bool, response_time_ms: float, error: Optional[str] = None):
     """Log trade execution result"""
     status = "SUCCESS" if success else "FAILED"
-    log_msg = f"TRADE_RESULT: {order_id} | {status} | {response_time_ms:.2f}ms"
     if error:
-        log_msg += f" | Error: {error}"
-    logger.info(log_msg)
+        logger.info("TRADE_RESULT: %s | %s | %.2fms | Error: %s", order_id, status, response_time_ms, error)
+    else:
+        logger.info("TRADE_RESULT: %s | %s | %.2fms", order_id, status, response_time_ms)
+
+
+# Strong references to in-flight shutdown tasks
+_shutdown_tasks = set()
+
 
+def install_shutdown_handlers(stop: Callable[[], Awaitable[Any]]):
+    """Run stop() as a task on SIGINT/SIGTERM; call from inside the running loop"""
+    loop = asyncio.get_running_loop()
 
+    def handle_signal(signum):
+        logger.info(f"Received signal {signum}")
+        task = loop.create_task(stop())
+        _shutdown_tasks.add(task)
+        task.add_done_callback(_shutdown_tasks.discard)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, handle_signal, sig)
+
+
+# Shared read-only fallback for settings without metadata. SETTING_METADATA is
+# static config, so the lookups below are cached per key
+_EMPTY_METADATA = MappingProxyType({})
+
+
+@lru_cache(maxsize=256)
 def get_setting_display_name(setting_key: str) -> str:
     """Get user-friendly display name for a setting"""
-    from config import SETTING_METADATA
-    metadata = SETTING_METADATA.get(setting_key, {})
-    return metadata.get('display_name', setting_key.replace('_', ' ').title())
+    return SETTING_METADATA.get(setting_key, _EMPTY_METADATA).get('display_name', setting_key.replace('_', ' ').title())
 
 
+@lru_cache(maxsize=256)
 def get_setting_description(setting_key: str) -> str:
     """Get user-friendly description for a setting"""
-    from config import SETTING_METADATA
-    metadata = SETTING_METADATA.get(setting_key, {})
-    return metadata.get('description', '')
+    return SETTING_METADATA.get(setting_key, _EMPTY_METADATA).get('description', '')
 
 
+@lru_cache(maxsize=256)
 def get_setting_format_hint(setting_key: str) -> str:
     """Get format hint for a setting"""
-    from config import SETTING_METADATA
-    metadata = SETTING_METADATA.get(setting_key, {})
-    return metadata.get('format_hint', '')
+    return SETTING_METADATA.get(setting_key, _EMPTY_METADATA).get('format_hint', '')
 
 
 def format_wallet_display(wallet: Dict[str, Any]) -> str:
     """Format wallet information for display"""
-    name = wallet.get('name', 'Unknown Wallet')
-    address = wallet.get('address', '')
-    wallet_type = wallet.get('type', 'unknown').upper()
+    get = wallet.get
+    name = get('name', 'Unknown Wallet')
+    address = get('address', '')
+    wallet_type = get('type', 'unknown').upper()
 
-    if address:
-        short_address = f"{address[:8]}...{address[-6:]}"
-        return f"💳 **{name}**\n🔗 `{short_address}`\n🌐 {wallet_type} Network"
-    else:
-        return f"💳 **{name}**\n❌ No address available\n🌐 {wallet_type} Network"
+    address_line = f"🔗 `{shorten_address(address)}`" if address else "❌ No address available"
+    return f"💳 **{name}**\n{address_line}\n🌐 {wallet_type} Network"
 
 
 def get_sell_setting_with_fallback(user_settings: Dict[str, Any], setting_name: str, default: Any = None) -> Any:
@@ -939,13 +1219,15 @@ def get_sell_setting_with_fallback(user_settings: Dict[str, Any], setting_name:
     # Construct sell-specific key
     sell_key = f'sell_{setting_name}'
 
-    # Try sell-specific setting first
-    if sell_key in user_settings and user_settings[sell_key] is not None:
-        return user_settings[sell_key]
+    # Try sell-specific setting first (one probe: a missing key reads as None)
+    value = user_settings.get(sell_key)
+    if value is not None:
+        return value
 
     # Fall back to buy setting
-    if setting_name in user_settings and user_settings[setting_name] is not None:
-        return user_settings[setting_name]
+    value = user_settings.get(setting_name)
+    if value is not None:
+        return value
 
     # Fall back to default
     return default
@@ -955,18 +1237,21 @@ def get_sell_setting_with_fallback(user_settings: Dict[str, Any], setting_name:
 class PerformanceTimer:
     """Context manager for measuring execution time"""
 
+    __slots__ = ('operation_name', 'start_time')
+
     def __init__(self, operation_name: str):
         self.operation_name = operation_name
-        self.start_time = 0
+        self.start_time = 0.0
 
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = (time.time() - self.start_time) * 1000
-        logger.debug(f"PERF: {self.operation_name} took {duration:.2f}ms")
+        duration = (time.perf_counter() - self.start_time) * 1000
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PERF: %s took %.2fms", self.operation_name, duration)
 
         # Log slow operations
         if duration > 100:  # More than 100ms
-            logger.warning(f"SLOW_OPERATION: {self.operation_name} took {duration:.2f}ms")
\ No newline at end of file
+            logger.warning("SLOW_OPERATION: %s took %.2fms", self.operation_name, duration)
\ No newline at end of file